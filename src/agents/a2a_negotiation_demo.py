@@ -6,16 +6,304 @@ specialized agents in our A2A ecosystem.
 """
 
 import asyncio
+import hashlib
 import httpx
-import json
-from datetime import datetime
-from typing import Dict, Any
+import logging
+import logging.handlers
+import queue
+import socket
+import sys
+import orjson
+import time
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from urllib.parse import urlsplit, urlunsplit
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple, Type, TypeVar, Union
+from pydantic import BaseModel, ConfigDict, Field
+
+try:
+    import h2  # noqa: F401 - presence enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+# Shared client settings: one pool is kept open for the whole demo so each of
+# the agent hosts only pays connect cost once. HTTP/2 is negotiated via ALPN
+# for https agents, multiplexing the concurrent steps over one connection
+# per host; plain http agents stay on keep-alive HTTP/1.1.
+DEFAULT_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+# In-flight requests allowed per agent. httpx only caps the pool as a whole,
+# so this keeps a burst of concurrent steps from piling onto one agent.
+AGENT_CONCURRENCY = 8
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Agent endpoints the demo calls: name -> (agent, path)
+ENDPOINTS = {
+    "discover": ("discovery", "/api/discover-agents"),
+    "test_comm": ("discovery", "/api/test-communication"),
+    "batch": ("discovery", "/api/batch"),
+    "flight_search": ("flight", "/api/search-flights"),
+    "hotel_negotiate": ("hotel", "/api/negotiate-budget"),
+    "activity_search": ("activity", "/api/search-activities"),
+    "ai_itinerary": ("ai", "/api/generate-itinerary"),
+    "ai_disruption": ("ai", "/api/handle-disruption")
+}
+
+# Endpoints the discovery service forwards in a batch: read-only searches,
+# safe to repeat. _batch() sends calls to any other endpoint directly.
+BATCHABLE_ENDPOINTS = frozenset(("flight_search", "activity_search"))
+
+# Failures that mean a batch never reached the discovery service, so none of
+# its calls ran and they can be made directly instead
+BATCH_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Per-phase timeouts (seconds). Agents are local, so connecting and waiting
+# for a pooled connection should be near-instant; reads get the headroom.
+# AGENT_TIMEOUT_OVERRIDES adjusts individual phases for slower agents.
+DEFAULT_TIMEOUTS = {"connect": 2.0, "read": 15.0, "write": 5.0, "pool": 2.0}
+AGENT_TIMEOUT_OVERRIDES = {
+    "ai": {"read": 45.0}
+}
+
+# Cache TTLs adapt per key: a response that comes back unchanged
+# CACHE_STABLE_REFRESHES times in a row has its TTL doubled (up to the max),
+# and a changed response halves it (down to the min).
+CACHE_STABLE_REFRESHES = 2
+
+# Discovery results change on the order of minutes; the service may override
+# this by returning a ``ttl`` (seconds) alongside the discovery result.
+DISCOVERY_CACHE_TTL = 60.0
+DISCOVERY_CACHE_MIN_TTL = 15.0
+DISCOVERY_CACHE_MAX_TTL = 300.0
+
+# Quote/negotiation/activity responses for an identical request body are
+# reused for a shorter time, bounded to QUOTE_CACHE_SIZE entries (LRU).
+QUOTE_CACHE_TTL = 30.0
+QUOTE_CACHE_MIN_TTL = 5.0
+QUOTE_CACHE_MAX_TTL = 60.0
+QUOTE_CACHE_SIZE = 1024
+
+# One response cache per cacheable endpoint, keyed by a hash of the request
+# body. Endpoints not listed here are never cached.
+CACHE_POLICIES = {
+    "discover": {
+        "maxsize": 8,
+        "ttl": DISCOVERY_CACHE_TTL,
+        "min_ttl": DISCOVERY_CACHE_MIN_TTL,
+        "max_ttl": DISCOVERY_CACHE_MAX_TTL
+    },
+    "flight_search": {},
+    "hotel_negotiate": {},
+    "activity_search": {}
+}
+
+logger = logging.getLogger(__name__)
+
+# A request body: either a dict, or JSON already encoded with encode_body()
+Body = Union[Dict[str, Any], bytes]
+
+
+def dig(obj: Any, *path: Any, default: Any = None) -> Any:
+    """Follow ``path`` through nested dicts/lists, returning ``default`` on any miss"""
+    for key in path:
+        try:
+            obj = obj[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+    return obj
+
+
+# Paths into loosely-typed discovery responses
+ECOSYSTEM_STATUS = ("ecosystem_health", "status")
+
+
+def is_no_store(headers: Any) -> bool:
+    """Whether an agent marked its response as not cacheable"""
+    cache_control = f"{headers.get('cache-control', '')},{headers.get('x-cache-control', '')}"
+    return "no-store" in cache_control.lower()
+
+
+def encode_body(body: Body) -> bytes:
+    """Canonical (sorted-key) JSON encoding of a request body"""
+    if isinstance(body, bytes):
+        return body
+    return orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+
+
+# Response schemas. Only the fields the demo reads are declared, each with the
+# default the demo falls back to, so a partial response still validates.
+class FlightQuote(BaseModel):
+    total_price: float = 400
+    airline: str = "Airline"
+
+
+class FlightSearchResponse(BaseModel):
+    flights: List[FlightQuote] = []
+
+
+class HotelNegotiation(BaseModel):
+    negotiation_accepted: bool = False
+    total_price: Optional[float] = None
+    counter_offer_total: Optional[float] = None
+
+
+class HotelNegotiationResponse(BaseModel):
+    negotiation_result: HotelNegotiation = Field(default_factory=HotelNegotiation)
+
+
+class ActivityOption(BaseModel):
+    model_config = ConfigDict(extra="allow")
+    
+    total_cost: float = 0
+
+
+class ActivitySearchResponse(BaseModel):
+    activities: List[ActivityOption] = []
+
+
+class Itinerary(BaseModel):
+    confidence_score: float = 0
+    total_estimated_cost: float = 0
+    ai_insights: Dict[str, Any] = {}
+
+
+class ItineraryResponse(BaseModel):
+    itinerary_result: Itinerary = Field(default_factory=Itinerary)
+
+
+class DisruptionAlternative(BaseModel):
+    alternative_type: str = "N/A"
+    impact: str = "N/A"
+
+
+class DisruptionResult(BaseModel):
+    disruption_handled: bool = False
+    alternatives: List[DisruptionAlternative] = []
+
+
+class DisruptionResponse(BaseModel):
+    disruption_result: DisruptionResult = Field(default_factory=DisruptionResult)
+
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
+
+class BudgetAllocation(NamedTuple):
+    """How the trip budget ended up split between the agents"""
+    flight: float
+    hotel: float
+    activity: float
+    
+    @property
+    def total(self) -> float:
+        return self.flight + self.hotel + self.activity
+
+
+class _CacheEntry:
+    """A cached response plus what has been learned about how often it changes"""
+    
+    __slots__ = ("value", "digest", "expires_at", "ttl", "stable_refreshes")
+    
+    def __init__(self, value: Dict[str, Any], digest: bytes, ttl: float,
+                 stable_refreshes: int = 0):
+        self.value = value
+        self.digest = digest
+        self.ttl = ttl
+        self.expires_at = time.monotonic() + ttl
+        self.stable_refreshes = stable_refreshes
+
+
+class ResponseCache:
+    """Bounded LRU cache of agent responses with a per-key adaptive TTL.
+    
+    Expired entries are kept (until evicted) so the next response for the
+    same key can be compared with the old one. Keys whose responses keep
+    coming back unchanged are cached for longer, and keys that change are
+    cached for less time.
+    """
+    
+    def __init__(self, maxsize: int = QUOTE_CACHE_SIZE, ttl: float = QUOTE_CACHE_TTL,
+                 min_ttl: float = QUOTE_CACHE_MIN_TTL, max_ttl: float = QUOTE_CACHE_MAX_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[bytes, _CacheEntry]" = OrderedDict()
+    
+    @staticmethod
+    def make_key(body: Body) -> bytes:
+        """Stable key for a request body: hash of its canonical JSON"""
+        return hashlib.blake2b(encode_body(body), digest_size=16).digest()
+    
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+    
+    def put(self, key: bytes, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Store a fresh response; ``ttl`` pins the TTL instead of learning it"""
+        digest = hashlib.blake2b(orjson.dumps(value, option=orjson.OPT_SORT_KEYS),
+                                 digest_size=16).digest()
+        previous = self._entries.get(key)
+        stable_refreshes = 0
+        if ttl is None:
+            if previous is None:
+                ttl = self.ttl
+            elif previous.digest != digest:
+                ttl = max(previous.ttl / 2, self.min_ttl)
+            else:
+                ttl = previous.ttl
+                stable_refreshes = previous.stable_refreshes + 1
+                if stable_refreshes >= CACHE_STABLE_REFRESHES:
+                    ttl = min(ttl * 2, self.max_ttl)
+                    stable_refreshes = 0
+        self._entries[key] = _CacheEntry(value, digest, ttl, stable_refreshes)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def ttl_for(self, key: bytes) -> float:
+        """TTL currently learned for a key"""
+        entry = self._entries.get(key)
+        return entry.ttl if entry is not None else self.ttl
+    
+    def clear(self) -> None:
+        self._entries.clear()
 
 
 class A2AAgentNegotiationDemo:
     """Demonstrate A2A agent negotiation and coordination"""
     
-    def __init__(self):
+    def __init__(self, *, timeouts: Optional[Dict[str, float]] = None,
+                 agent_timeouts: Optional[Dict[str, Dict[str, float]]] = None,
+                 limits: Optional[httpx.Limits] = None,
+                 agent_concurrency: int = AGENT_CONCURRENCY,
+                 agent_concurrency_overrides: Optional[Dict[str, int]] = None,
+                 prewarm: bool = True):
+        self._timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self._timeout = httpx.Timeout(**self._timeouts)
+        self._agent_timeouts = {
+            agent: self.with_timeout(**overrides)
+            for agent, overrides in {**AGENT_TIMEOUT_OVERRIDES, **(agent_timeouts or {})}.items()
+        }
+        self._limits = limits or DEFAULT_LIMITS
+        self._prewarm = prewarm
+        self._client: Optional[httpx.AsyncClient] = None
+        self._caches = {
+            endpoint: ResponseCache(**policy)
+            for endpoint, policy in CACHE_POLICIES.items()
+        }
+        
         self.agents = {
             "discovery": "http://localhost:8005",
             "flight": "http://localhost:8001", 
@@ -23,6 +311,26 @@ class A2AAgentNegotiationDemo:
             "activity": "http://localhost:8003",
             "ai": "http://localhost:8004"
         }
+        # Plain-http agents are resolved once on entry (pin_agents) and then
+        # addressed by IP, with the original Host header, so no connection
+        # repeats the lookup. Until then they are addressed by name.
+        self._agent_sockaddrs: Dict[str, Tuple[Any, ...]] = {}
+        self._agent_base_urls: Dict[str, str] = dict(self.agents)
+        self._agent_headers: Dict[str, Dict[str, str]] = {name: JSON_HEADERS for name in self.agents}
+        self._endpoints: Dict[str, str] = {}
+        self._build_endpoints()
+        overrides = agent_concurrency_overrides or {}
+        self._sems = {
+            name: asyncio.Semaphore(overrides.get(name, agent_concurrency))
+            for name in self.agents
+        }
+        # Registry ids used when routing calls through the discovery batch endpoint
+        self.agent_ids = {
+            "flight": "flight-booking-agent",
+            "hotel": "hotel-booking-agent",
+            "activity": "activity-planning-agent",
+            "ai": "gemini-ai-agent"
+        }
         
         # Sample trip request for negotiation
         self.trip_request = {
@@ -34,64 +342,309 @@ class A2AAgentNegotiationDemo:
             "total_budget": 1200,
             "preferences": ["tech_tours", "good_food", "hackathon_venue"]
         }
+        
+        # Bodies that never change during a run are encoded once up front and
+        # sent as raw bytes; they also key the response cache without
+        # re-encoding. Rebuild the demo if trip_request is changed.
+        self._flight_search_body = encode_body({
+            "departure_airport": "JFK",
+            "arrival_airport": "MIA", 
+            "departure_date": self.trip_request['start_date'],
+            "return_date": self.trip_request['end_date'],
+            "passengers": self.trip_request['travelers'],
+            "budget_constraint": 500
+        })
+        self._ai_optimization_body = encode_body({
+            "trip_data": self.trip_request,
+            "special_instructions": "Optimize for hackathon attendees with tech interests",
+            "coordination_data": {
+                "flights": [{"airline": "JetBlue", "price": 380}],
+                "hotels": [{"name": "Tech Hotel", "price": 160}],
+                "activities": [{"name": "Tech Museum", "type": "educational"}]
+            }
+        })
+        self._disruption_body = encode_body({
+            "disruption_type": "flight_delay",
+            "severity": "medium", 
+            "affected_components": ["arrival_time", "hotel_checkin"],
+            "current_itinerary": [
+                {"date": "2025-09-28", "events": [{"time": "14:00", "type": "hotel_checkin"}]}
+            ]
+        })
+    
+    def _build_endpoints(self) -> None:
+        """Full (possibly IP-pinned) URL per endpoint"""
+        self._endpoints = {
+            name: f"{self._agent_base_urls[agent]}{path}"
+            for name, (agent, path) in ENDPOINTS.items()
+        }
+    
+    async def pin_agents(self) -> None:
+        """Resolve every agent's host in parallel and address it by IP from then on"""
+        await asyncio.gather(*(self._pin_agent(name, url) for name, url in self.agents.items()))
+        self._build_endpoints()
+    
+    async def _pin_agent(self, name: str, url: str) -> None:
+        """Resolve an agent's host without blocking the loop and pin it to the result"""
+        parts = urlsplit(url)
+        # https needs the hostname for SNI and certificate checks
+        if parts.scheme != "http" or not parts.hostname:
+            return
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                parts.hostname, parts.port or 80, type=socket.SOCK_STREAM
+            )
+        except OSError:
+            return
+        if not infos:
+            return
+        # Prefer IPv4: agents bound to 0.0.0.0 don't listen on ::1
+        family, _, _, _, sockaddr = next(
+            (info for info in infos if info[0] == socket.AF_INET), infos[0]
+        )
+        host = f"[{sockaddr[0]}]" if family == socket.AF_INET6 else sockaddr[0]
+        netloc = f"{host}:{sockaddr[1]}"
+        self._agent_sockaddrs[name] = sockaddr
+        self._agent_base_urls[name] = urlunsplit((parts.scheme, netloc, parts.path, "", ""))
+        self._agent_headers[name] = {**JSON_HEADERS, "Host": parts.netloc}
+    
+    async def __aenter__(self) -> "A2AAgentNegotiationDemo":
+        self._client = httpx.AsyncClient(
+            timeout=self._timeout,
+            limits=self._limits,
+            http2=HTTP2_AVAILABLE
+        )
+        await self.pin_agents()
+        if self._prewarm:
+            await self.prewarm()
+        return self
+    
+    async def prewarm(self) -> None:
+        """Open a pooled connection to every agent in parallel.
+        
+        Agents expose their info on ``GET /``, which is cheap enough to use as
+        a warm-up; by the time discovery runs the handshakes are done. Agents
+        that are down are ignored here and reported by the demo steps.
+        """
+        await asyncio.gather(
+            *(self.client.get(f"{self._agent_base_urls[name]}/",
+                              headers=self._agent_headers[name],
+                              timeout=self.with_timeout(read=2.0))
+              for name in self.agents),
+            return_exceptions=True
+        )
+    
+    async def __aexit__(self, *exc_info) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, available inside ``async with demo:``"""
+        if self._client is None:
+            raise RuntimeError("A2AAgentNegotiationDemo must be used as 'async with demo:'")
+        return self._client
+    
+    def with_timeout(self, **overrides: float) -> httpx.Timeout:
+        """Client timeouts with some phases overridden, e.g. ``with_timeout(read=45.0)``"""
+        return httpx.Timeout(**{**self._timeouts, **overrides})
+    
+    def timeout_for(self, agent: str) -> httpx.Timeout:
+        """Timeouts to use for calls to the given agent"""
+        return self._agent_timeouts.get(agent, self._timeout)
+    
+    async def _send(self, endpoint: str, body: Optional[Body],
+                    timeout: Optional[httpx.Timeout]) -> httpx.Response:
+        agent = ENDPOINTS[endpoint][0]
+        if body is not None and not isinstance(body, bytes):
+            body = orjson.dumps(body)
+        async with self._sems[agent]:
+            response = await self.client.post(
+                self._endpoints[endpoint],
+                content=body,
+                headers=self._agent_headers[agent],
+                timeout=timeout or self.timeout_for(agent)
+            )
+        response.raise_for_status()
+        return response
+    
+    async def _post(self, endpoint: str, body: Optional[Body] = None,
+                    *, timeout: Optional[httpx.Timeout] = None) -> Dict[str, Any]:
+        """POST to an agent endpoint on the shared client and return the decoded JSON"""
+        response = await self._send(endpoint, body, timeout)
+        return orjson.loads(response.content)
+    
+    async def _post_typed(self, endpoint: str, body: Optional[Body],
+                          model: Type[ResponseModel]) -> ResponseModel:
+        """POST to an agent endpoint and validate the raw response body straight into ``model``"""
+        response = await self._send(endpoint, body, None)
+        return model.model_validate_json(response.content)
+    
+    async def _cached_post(self, endpoint: str, body: Body) -> Dict[str, Any]:
+        """Like _post, but reuses a recent response for an identical request"""
+        cache = self._caches[endpoint]
+        key = ResponseCache.make_key(body)
+        result = cache.get(key)
+        if result is None:
+            response = await self._send(endpoint, body, None)
+            result = orjson.loads(response.content)
+            if not is_no_store(response.headers):
+                cache.put(key, result)
+        return result
+    
+    async def _batch(self, calls: List[Tuple[str, Dict[str, Any]]]
+                     ) -> List[Union[Dict[str, Any], Exception]]:
+        """Send several (endpoint, body) calls in one round trip.
+        
+        Calls to BATCHABLE_ENDPOINTS are forwarded by the discovery service's
+        /api/batch endpoint; the rest are sent directly alongside the batch.
+        Results come back in request order; a failed call is returned as an
+        Exception, like ``asyncio.gather(..., return_exceptions=True)``.
+        Cached responses are served locally and only misses are sent.
+        
+        If the batch can't reach the discovery service its calls are made
+        directly. Once it has been sent, a failure is returned for each of its
+        calls instead: they may already have run, so they are never replayed.
+        
+        While the batch is in flight it holds a concurrency slot for each agent
+        it calls (sub-calls to the same agent share one), so batched traffic
+        counts against the same per-agent limits as direct calls.
+        """
+        caches = [self._caches[endpoint] for endpoint, _ in calls]
+        keys = [ResponseCache.make_key(body) for _, body in calls]
+        results: List[Union[Dict[str, Any], Exception, None]] = [
+            cache.get(key) for cache, key in zip(caches, keys)
+        ]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if not misses:
+            return results
+        
+        async def send_direct(indices: List[int]) -> None:
+            direct = await asyncio.gather(
+                *(self._cached_post(*calls[i]) for i in indices),
+                return_exceptions=True
+            )
+            for i, result in zip(indices, direct):
+                results[i] = result
+        
+        async def send_batch(indices: List[int]) -> None:
+            if not indices:
+                return
+            try:
+                responses = await self._post_batch([calls[i] for i in indices])
+            except BATCH_NOT_SENT:
+                await send_direct(indices)
+                return
+            except Exception as e:
+                for i in indices:
+                    results[i] = RuntimeError(f"batch failed: {e}")
+                return
+            
+            if not isinstance(responses, list) or len(responses) != len(indices):
+                for i in indices:
+                    results[i] = RuntimeError("batch response does not match request")
+                return
+            for i, response in zip(indices, responses):
+                if not isinstance(response, dict):
+                    results[i] = RuntimeError("malformed batch result")
+                elif not response.get('success'):
+                    results[i] = RuntimeError(response.get('error', 'batch call failed'))
+                else:
+                    results[i] = response.get('result', {})
+                    headers = response.get('headers', {})
+                    if isinstance(headers, dict) and not is_no_store(headers):
+                        caches[i].put(keys[i], results[i])
+        
+        batched = [i for i in misses if calls[i][0] in BATCHABLE_ENDPOINTS]
+        direct = [i for i in misses if calls[i][0] not in BATCHABLE_ENDPOINTS]
+        await asyncio.gather(send_batch(batched), send_direct(direct))
+        return results
+    
+    async def _post_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> Any:
+        """POST calls to the discovery service's /api/batch and return its results list"""
+        batch_calls = []
+        batch_agents = set()
+        for endpoint, body in calls:
+            agent, path = ENDPOINTS[endpoint]
+            batch_agents.add(agent)
+            batch_calls.append({"agent": self.agent_ids[agent], "path": path, "body": body})
+        async with AsyncExitStack() as slots:
+            # Fixed order, so concurrent batches can't each hold a slot the
+            # other is waiting for
+            for agent in sorted(batch_agents):
+                await slots.enter_async_context(self._sems[agent])
+            batch = await self._post("batch", {"calls": batch_calls})
+        return batch.get('results') if isinstance(batch, dict) else None
     
     async def run_full_demo(self):
         """Run complete A2A negotiation demonstration"""
-        print("🚀 Starting A2A Agent Negotiation Demo")
-        print("=" * 50)
+        logger.info("🚀 Starting A2A Agent Negotiation Demo")
+        logger.info("=" * 50)
         
         # Step 1: Discover agents
-        print("🔍 Step 1: Discovering A2A agents...")
+        logger.info("🔍 Step 1: Discovering A2A agents...")
         discovery_result = await self.discover_agents()
         
         if discovery_result:
-            print(f"✅ Discovered {discovery_result.get('total_discovered', 0)} agents")
+            logger.info("✅ Discovered %s agents", discovery_result.get('total_discovered', 0))
         else:
-            print("❌ Agent discovery failed")
+            logger.error("❌ Agent discovery failed")
             return
         
-        # Step 2: Test agent communication
-        print("\n🔗 Step 2: Testing agent communication...")
-        await self.test_agent_communication()
-        
-        # Step 3: Coordinate budget negotiation
-        print("\n💰 Step 3: Coordinating budget negotiation...")
-        await self.demonstrate_budget_negotiation()
-        
-        # Step 4: Show AI-powered optimization
-        print("\n🧠 Step 4: AI-powered trip optimization...")
-        await self.demonstrate_ai_optimization()
-        
-        # Step 5: Test disruption handling
-        print("\n🚨 Step 5: Testing disruption handling...")
-        await self.demonstrate_disruption_handling()
+        # Steps 2-5 have no data dependency on each other, so run them
+        # concurrently; the budget negotiation keeps its own
+        # flight -> hotel -> activity ordering internally.
+        logger.info("\n🔗 Step 2: Testing agent communication...")
+        logger.info("💰 Step 3: Coordinating budget negotiation...")
+        logger.info("🧠 Step 4: AI-powered trip optimization...")
+        logger.info("🚨 Step 5: Testing disruption handling...")
+        await asyncio.gather(
+            self.test_agent_communication(),
+            self.demonstrate_budget_negotiation(),
+            self.demonstrate_ai_optimization(),
+            self.demonstrate_disruption_handling(),
+        )
         
-        print("\n✅ A2A Agent Negotiation Demo Complete!")
-        print("🤝 Agents successfully negotiated and coordinated")
+        logger.info("\n✅ A2A Agent Negotiation Demo Complete!")
+        logger.info("🤝 Agents successfully negotiated and coordinated")
     
-    async def discover_agents(self) -> Dict[str, Any]:
-        """Discover all agents in the ecosystem"""
+    async def discover_agents(self, *, refresh: bool = False) -> Dict[str, Any]:
+        """Discover all agents in the ecosystem, reusing a recent result if cached"""
+        cache = self._caches["discover"]
+        key = ResponseCache.make_key(b"")
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(f"{self.agents['discovery']}/api/discover-agents")
-                response.raise_for_status()
-                
-                result = response.json()
+            discovery_data = None if refresh else cache.get(key)
+            if discovery_data is None:
+                result = await self._post("discover")
                 discovery_data = result.get('discovery_result', {})
-                
-                print(f"   📊 Ecosystem Health: {discovery_data.get('ecosystem_health', {}).get('status', 'unknown')}")
-                
+                if discovery_data:
+                    ttl = discovery_data.get('ttl')
+                    cache.put(key, discovery_data, float(ttl) if ttl is not None else None)
+            
+            logger.info("   📊 Ecosystem Health: %s", dig(discovery_data, *ECOSYSTEM_STATUS, default='unknown'))
+            
+            if logger.isEnabledFor(logging.INFO):
                 active_agents = discovery_data.get('active_agents', [])
                 for agent in active_agents:
-                    print(f"   🤖 {agent.get('name', 'Unknown')} ({agent.get('agent_id', 'unknown')})")
-                    print(f"      Capabilities: {', '.join(agent.get('capabilities', [])[:3])}...")
-                
-                return discovery_data
+                    logger.info("   🤖 %s (%s)", agent.get('name', 'Unknown'), agent.get('agent_id', 'unknown'))
+                    logger.info("      Capabilities: %s...", ', '.join(agent.get('capabilities', [])[:3]))
                 
+            return discovery_data
+            
         except Exception as e:
-            print(f"   ❌ Discovery failed: {e}")
+            logger.error("   ❌ Discovery failed: %s", e)
             return {}
     
+    def invalidate_discovery_cache(self) -> None:
+        """Drop cached discovery results so the next call hits the service"""
+        self._caches["discover"].clear()
+    
+    def reset_caches(self) -> None:
+        """Drop every cached agent response, e.g. before a fresh demo run"""
+        for cache in self._caches.values():
+            cache.clear()
+    
     async def test_agent_communication(self):
         """Test communication between agents"""
         try:
@@ -101,239 +654,255 @@ class A2AAgentNegotiationDemo:
                 "target_agent_id": "hotel-booking-agent"
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.agents['discovery']}/api/test-communication",
-                    json=test_request
-                )
-                response.raise_for_status()
-                
-                result = response.json()
+            result = await self._post(
+                "test_comm",
+                test_request
+            )
+            
+            if result.get('success'):
+                logger.info("   ✅ Communication test passed")
+                logger.info("      Response time: %.0fms", result.get('response_time_ms', 0))
+                logger.info("      Target capabilities: %s...", ', '.join(result.get('target_capabilities', [])[:3]))
+            else:
+                logger.error("   ❌ Communication test failed: %s", result.get('error'))
                 
-                if result.get('success'):
-                    print(f"   ✅ Communication test passed")
-                    print(f"      Response time: {result.get('response_time_ms', 0):.0f}ms")
-                    print(f"      Target capabilities: {', '.join(result.get('target_capabilities', [])[:3])}...")
-                else:
-                    print(f"   ❌ Communication test failed: {result.get('error')}")
-                    
         except Exception as e:
-            print(f"   ❌ Communication test error: {e}")
+            logger.error("   ❌ Communication test error: %s", e)
     
-    async def demonstrate_budget_negotiation(self):
+    async def demonstrate_budget_negotiation(self) -> BudgetAllocation:
         """Demonstrate budget negotiation between agents"""
-        total_budget = self.trip_request['total_budget']
+        trip_request = self.trip_request
+        total_budget = trip_request['total_budget']
         
-        print(f"   💵 Total Budget: ${total_budget}")
-        print(f"   👥 Travelers: {self.trip_request['travelers']}")
+        logger.info("   💵 Total Budget: $%s", total_budget)
+        logger.info("   👥 Travelers: %s", trip_request['travelers'])
         
-        # Step 1: Get flight quotes
+        # Round 1: Get flight quotes
         flight_data = await self.get_flight_quotes()
         flight_cost = flight_data.get('estimated_cost', 400)
         
-        # Step 2: Negotiate hotel budget with remaining funds
+        # Round 2: Negotiate the hotel (60% of remaining funds) and search
+        # activities at the same time. The activity budget is whatever the
+        # hotel leaves, which isn't known yet, so the search is sized for all
+        # remaining funds and the results are planned against
+        # remaining_budget - hotel_cost once both are back.
         remaining_budget = total_budget - flight_cost
-        hotel_data = await self.negotiate_hotel_budget(remaining_budget * 0.6)  # 60% for hotel
-        hotel_cost = hotel_data.get('final_cost', remaining_budget * 0.6)
+        hotel_budget = remaining_budget * 0.6
+        hotel_result, activity_result = await self._batch([
+            ("hotel_negotiate", self._hotel_negotiation_body(hotel_budget)),
+            ("activity_search", self._activity_search_body(remaining_budget)),
+        ])
+        hotel_data = self._summarize_hotel_negotiation(hotel_result, hotel_budget)
+        hotel_cost = hotel_data.get('final_cost', hotel_budget)
         
-        # Step 3: Allocate activity budget
-        activity_budget = remaining_budget - hotel_cost
-        activity_data = await self.plan_activities_within_budget(activity_budget)
+        # Allocate activity budget
+        alloc = BudgetAllocation(flight_cost, hotel_cost, remaining_budget - hotel_cost)
+        self._plan_activities(activity_result, alloc.activity)
         
-        print(f"\n   📊 Budget Negotiation Results:")
-        print(f"      ✈️  Flights: ${flight_cost:.0f}")
-        print(f"      🏨 Hotels: ${hotel_cost:.0f}")
-        print(f"      🎯 Activities: ${activity_budget:.0f}")
-        print(f"      💰 Total: ${flight_cost + hotel_cost + activity_budget:.0f} / ${total_budget}")
+        total_cost = alloc.total
+        logger.info("\n   📊 Budget Negotiation Results:")
+        logger.info("      ✈️  Flights: $%.0f", alloc.flight)
+        logger.info("      🏨 Hotels: $%.0f", alloc.hotel)
+        logger.info("      🎯 Activities: $%.0f", alloc.activity)
+        logger.info("      💰 Total: $%.0f / $%s", total_cost, total_budget)
         
         # Check if negotiation was successful
-        if flight_cost + hotel_cost + activity_budget <= total_budget:
-            print("   ✅ Budget negotiation successful - within limits!")
+        if total_cost <= total_budget:
+            logger.info("   ✅ Budget negotiation successful - within limits!")
         else:
-            print("   ⚠️  Budget negotiation needed optimization")
+            logger.warning("   ⚠️  Budget negotiation needed optimization")
+        
+        return alloc
     
     async def get_flight_quotes(self) -> Dict[str, Any]:
         """Get flight quotes from flight agent"""
         try:
-            search_data = {
-                "departure_airport": "JFK",
-                "arrival_airport": "MIA", 
-                "departure_date": self.trip_request['start_date'],
-                "return_date": self.trip_request['end_date'],
-                "passengers": self.trip_request['travelers'],
-                "budget_constraint": 500
-            }
+            result = await self._cached_post(
+                "flight_search",
+                self._flight_search_body
+            )
+            flights = FlightSearchResponse.model_validate(result).flights
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.agents['flight']}/api/search-flights",
-                    json=search_data
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                flights = result.get('flights', [])
-                
-                if flights:
-                    best_flight = flights[0]
-                    print(f"   ✈️  Flight Quote: ${best_flight.get('total_price', 400)} via {best_flight.get('airline', 'Airline')}")
-                    return {"estimated_cost": best_flight.get('total_price', 400)}
+            if flights:
+                best_flight = flights[0]
+                logger.info("   ✈️  Flight Quote: $%s via %s", best_flight.total_price, best_flight.airline)
+                return {"estimated_cost": best_flight.total_price}
                 
         except Exception as e:
-            print(f"   ❌ Flight quote error: {e}")
+            logger.error("   ❌ Flight quote error: %s", e)
         
         return {"estimated_cost": 400}  # Fallback
     
     async def negotiate_hotel_budget(self, available_budget: float) -> Dict[str, Any]:
         """Negotiate hotel pricing with available budget"""
         try:
-            negotiation_data = {
-                "hotel_id": "HTL001_demo",
-                "available_budget": available_budget,
-                "nights": 2,
-                "current_price_per_night": 200
-            }
+            result = await self._cached_post(
+                "hotel_negotiate",
+                self._hotel_negotiation_body(available_budget)
+            )
+        except Exception as e:
+            result = e
+        return self._summarize_hotel_negotiation(result, available_budget)
+    
+    def _hotel_negotiation_body(self, available_budget: float) -> Dict[str, Any]:
+        return {
+            "hotel_id": "HTL001_demo",
+            "available_budget": available_budget,
+            "nights": 2,
+            "current_price_per_night": 200
+        }
+    
+    def _summarize_hotel_negotiation(self, result: Union[Dict[str, Any], Exception],
+                                     available_budget: float) -> Dict[str, Any]:
+        """Turn a hotel agent negotiation response into the agreed cost"""
+        try:
+            if isinstance(result, Exception):
+                raise result
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.agents['hotel']}/api/negotiate-budget",
-                    json=negotiation_data
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                negotiation = result.get('negotiation_result', {})
+            negotiation = HotelNegotiationResponse.model_validate(result).negotiation_result
+            
+            if negotiation.negotiation_accepted:
+                final_price = negotiation.total_price if negotiation.total_price is not None else available_budget
+                logger.info("   🏨 Hotel Negotiation: $%s (accepted)", final_price)
+                return {"final_cost": final_price}
+            else:
+                counter_offer = (negotiation.counter_offer_total
+                                 if negotiation.counter_offer_total is not None else available_budget)
+                logger.info("   🏨 Hotel Negotiation: $%s (counter-offer)", counter_offer)
+                return {"final_cost": counter_offer}
                 
-                if negotiation.get('negotiation_accepted'):
-                    final_price = negotiation.get('total_price', available_budget)
-                    print(f"   🏨 Hotel Negotiation: ${final_price} (accepted)")
-                    return {"final_cost": final_price}
-                else:
-                    counter_offer = negotiation.get('counter_offer_total', available_budget)
-                    print(f"   🏨 Hotel Negotiation: ${counter_offer} (counter-offer)")
-                    return {"final_cost": counter_offer}
-                    
         except Exception as e:
-            print(f"   ❌ Hotel negotiation error: {e}")
+            logger.error("   ❌ Hotel negotiation error: %s", e)
         
         return {"final_cost": available_budget}
     
     async def plan_activities_within_budget(self, activity_budget: float) -> Dict[str, Any]:
         """Plan activities within remaining budget"""
         try:
-            activity_data = {
-                "destination": self.trip_request['destination'],
-                "budget_per_person": activity_budget / self.trip_request['travelers'],
-                "group_size": self.trip_request['travelers'],
-                "activity_types": ["museums", "tours", "food_tour"]
-            }
+            result = await self._cached_post(
+                "activity_search",
+                self._activity_search_body(activity_budget)
+            )
+        except Exception as e:
+            result = e
+        return self._plan_activities(result, activity_budget)
+    
+    def _activity_search_body(self, activity_budget: float) -> Dict[str, Any]:
+        return {
+            "destination": self.trip_request['destination'],
+            "budget_per_person": activity_budget / self.trip_request['travelers'],
+            "group_size": self.trip_request['travelers'],
+            "activity_types": ["museums", "tours", "food_tour"]
+        }
+    
+    def _plan_activities(self, result: Union[Dict[str, Any], Exception],
+                         activity_budget: float) -> Dict[str, Any]:
+        """Pick activities from an activity agent response that fit the budget"""
+        try:
+            if isinstance(result, Exception):
+                raise result
+            
+            activities = ActivitySearchResponse.model_validate(result).activities
+            
+            total_cost = 0
+            planned_activities = []
+            
+            for activity in activities:
+                cost = activity.total_cost
+                if total_cost + cost <= activity_budget:
+                    planned_activities.append(activity)
+                    total_cost += cost
+            
+            logger.info("   🎯 Activities Planned: %d within $%.0f budget", len(planned_activities), activity_budget)
+            return {"activities": planned_activities, "total_cost": total_cost}
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.agents['activity']}/api/search-activities",
-                    json=activity_data
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                activities = result.get('activities', [])
-                
-                total_cost = 0
-                planned_activities = []
-                
-                for activity in activities:
-                    cost = activity.get('total_cost', 0)
-                    if total_cost + cost <= activity_budget:
-                        planned_activities.append(activity)
-                        total_cost += cost
-                
-                print(f"   🎯 Activities Planned: {len(planned_activities)} within ${activity_budget:.0f} budget")
-                return {"activities": planned_activities, "total_cost": total_cost}
-                
         except Exception as e:
-            print(f"   ❌ Activity planning error: {e}")
+            logger.error("   ❌ Activity planning error: %s", e)
         
         return {"activities": [], "total_cost": 0}
     
     async def demonstrate_ai_optimization(self):
         """Demonstrate AI-powered trip optimization"""
         try:
-            optimization_data = {
-                "trip_data": self.trip_request,
-                "special_instructions": "Optimize for hackathon attendees with tech interests",
-                "coordination_data": {
-                    "flights": [{"airline": "JetBlue", "price": 380}],
-                    "hotels": [{"name": "Tech Hotel", "price": 160}],
-                    "activities": [{"name": "Tech Museum", "type": "educational"}]
-                }
-            }
+            result = await self._post_typed(
+                "ai_itinerary",
+                self._ai_optimization_body, ItineraryResponse
+            )
+            itinerary_result = result.itinerary_result
             
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(
-                    f"{self.agents['ai']}/api/generate-itinerary",
-                    json=optimization_data
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                itinerary_result = result.get('itinerary_result', {})
-                
-                confidence_score = itinerary_result.get('confidence_score', 0)
-                total_cost = itinerary_result.get('total_estimated_cost', 0)
-                
-                print(f"   🧠 AI Optimization Complete")
-                print(f"      Confidence Score: {confidence_score:.2f}")
-                print(f"      Estimated Cost: ${total_cost:.0f}")
-                
-                ai_insights = itinerary_result.get('ai_insights', {})
-                if ai_insights:
-                    print(f"      Personalization Score: {ai_insights.get('personalization_score', 'N/A')}")
+            confidence_score = itinerary_result.confidence_score
+            total_cost = itinerary_result.total_estimated_cost
+            
+            logger.info("   🧠 AI Optimization Complete")
+            logger.info("      Confidence Score: %.2f", confidence_score)
+            logger.info("      Estimated Cost: $%.0f", total_cost)
+            
+            ai_insights = itinerary_result.ai_insights
+            if ai_insights:
+                logger.info("      Personalization Score: %s", ai_insights.get('personalization_score', 'N/A'))
                 
         except Exception as e:
-            print(f"   ❌ AI optimization error: {e}")
+            logger.error("   ❌ AI optimization error: %s", e)
     
     async def demonstrate_disruption_handling(self):
         """Demonstrate disruption handling coordination"""
         try:
-            disruption_data = {
-                "disruption_type": "flight_delay",
-                "severity": "medium", 
-                "affected_components": ["arrival_time", "hotel_checkin"],
-                "current_itinerary": [
-                    {"date": "2025-09-28", "events": [{"time": "14:00", "type": "hotel_checkin"}]}
-                ]
-            }
+            result = await self._post_typed(
+                "ai_disruption",
+                self._disruption_body, DisruptionResponse
+            )
+            disruption_result = result.disruption_result
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.agents['ai']}/api/handle-disruption",
-                    json=disruption_data
-                )
-                response.raise_for_status()
+            if disruption_result.disruption_handled:
+                alternatives = disruption_result.alternatives
+                logger.info("   🚨 Disruption Handled: %d alternatives provided", len(alternatives))
                 
-                result = response.json()
-                disruption_result = result.get('disruption_result', {})
+                if alternatives:
+                    best_alternative = alternatives[0]
+                    logger.info("      Best Option: %s", best_alternative.alternative_type)
+                    logger.info("      Impact Level: %s", best_alternative.impact)
+            else:
+                logger.error("   ❌ Disruption handling failed")
                 
-                if disruption_result.get('disruption_handled'):
-                    alternatives = disruption_result.get('alternatives', [])
-                    print(f"   🚨 Disruption Handled: {len(alternatives)} alternatives provided")
-                    
-                    if alternatives:
-                        best_alternative = alternatives[0]
-                        print(f"      Best Option: {best_alternative.get('alternative_type', 'N/A')}")
-                        print(f"      Impact Level: {best_alternative.get('impact', 'N/A')}")
-                else:
-                    print(f"   ❌ Disruption handling failed")
-                    
         except Exception as e:
-            print(f"   ❌ Disruption handling error: {e}")
+            logger.error("   ❌ Disruption handling error: %s", e)
+
+
+def start_demo_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """Route demo output through a queue so writing to stdout happens off the event loop"""
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    listener.start()
+    return listener
 
 
 async def main():
     """Run the A2A negotiation demo"""
-    demo = A2AAgentNegotiationDemo()
-    await demo.run_full_demo()
+    listener = start_demo_logging()
+    try:
+        async with A2AAgentNegotiationDemo() as demo:
+            await demo.run_full_demo()
+    finally:
+        listener.stop()
+
+
+def run_demo() -> None:
+    """Run main() on uvloop when it is installed, else on the default loop"""
+    if not UVLOOP_AVAILABLE:
+        asyncio.run(main())
+    elif sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
+    else:
+        uvloop.install()
+        asyncio.run(main())
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_demo()
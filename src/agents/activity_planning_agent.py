@@ -6,17 +6,146 @@ using TripAdvisor and Google Places APIs while coordinating with other agents.
 """
 
 import asyncio
+import hashlib
+import httpx
+import importlib.util
+import itertools
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, date, timedelta, time
-from pydantic import BaseModel
-import uvicorn
+import orjson
+import os
+import random
+import sys
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any, Tuple
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+# travel_apis lives one directory up; make it importable once, at import time
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.append(_SRC_DIR)
+try:
+    from travel_apis import TravelAPIManager
+    _TRAVEL_APIS_IMPORT_ERROR: Optional[ImportError] = None
+except ImportError as e:
+    TravelAPIManager = None
+    _TRAVEL_APIS_IMPORT_ERROR = e
 
 logger = logging.getLogger(__name__)
 
+# Maximum concurrent calls to the upstream activity/restaurant APIs
+API_CONCURRENCY = 10
+
+# Pool shared by every upstream call the agent makes (Google Places,
+# TripAdvisor), so connections and TLS sessions are reused between searches
+UPSTREAM_TIMEOUT = 30.0
+UPSTREAM_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+# Decorrelated-jitter backoff between restaurant search retries (seconds)
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 10.0
+
+# Upstream search results change slowly; identical searches within the TTL
+# are answered from memory, bounded to UPSTREAM_CACHE_SIZE entries (LRU).
+UPSTREAM_CACHE_TTL = 3600.0
+UPSTREAM_CACHE_SIZE = 2048
+
+# Process-wide upstream client and API manager, shared by every agent instance
+# in the process. Each holder acquires it once and releases it once; the client
+# is closed when the last holder releases it.
+_UPSTREAM_HTTP: Optional[httpx.AsyncClient] = None
+_API_MGR: Optional["TravelAPIManager"] = None
+_API_MGR_REFS = 0
+
+
+def acquire_api_mgr() -> Optional["TravelAPIManager"]:
+    """Take a reference to the process-wide TravelAPIManager, creating it if needed
+    
+    Returns None if travel_apis is unavailable; nothing needs releasing then.
+    """
+    global _UPSTREAM_HTTP, _API_MGR, _API_MGR_REFS
+    if TravelAPIManager is None:
+        return None
+    if _API_MGR is None:
+        _UPSTREAM_HTTP = httpx.AsyncClient(timeout=UPSTREAM_TIMEOUT, limits=UPSTREAM_LIMITS)
+        _API_MGR = TravelAPIManager(client=_UPSTREAM_HTTP)
+    _API_MGR_REFS += 1
+    return _API_MGR
+
+
+async def release_api_mgr() -> None:
+    """Drop a reference taken by acquire_api_mgr(), closing the client after the last"""
+    global _UPSTREAM_HTTP, _API_MGR, _API_MGR_REFS
+    if _API_MGR_REFS == 0:
+        return
+    _API_MGR_REFS -= 1
+    if _API_MGR_REFS == 0:
+        client = _UPSTREAM_HTTP
+        _UPSTREAM_HTTP = None
+        _API_MGR = None
+        if client is not None:
+            await client.aclose()
+
+
+# Discovery responses (root and agent card) may be cached by pollers this long
+DISCOVERY_MAX_AGE = 300
+
+
+def _static_json(payload: Dict[str, Any]) -> Callable[[Request], Response]:
+    """Encode an unchanging payload once and serve it with an ETag, answering
+    matching If-None-Match requests with 304
+    """
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={DISCOVERY_MAX_AGE}"}
+    
+    def serve(request: Request) -> Response:
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    return serve
+
+
+# Serve on uvloop/httptools when installed (both ship with uvicorn[standard]);
+# ACTIVITY_AGENT_WORKERS > 1 runs that many worker processes.
+UVICORN_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+UVICORN_HTTP = "httptools" if importlib.util.find_spec("httptools") else "auto"
+
+# Coordination fields shared by every activity the agent returns
+_COORD_META = {
+    "agent_id": "activity-planning-agent",
+    "coordination_needed": ("timing", "transportation"),
+    "best_time_slots": ("morning", "afternoon")
+}
+
+# Reservation slots offered per meal
+_MEAL_SLOTS = {
+    "lunch": ("11:30", "12:00", "12:30", "13:00", "13:30"),
+    "dinner": ("17:30", "18:00", "18:30", "19:00", "19:30", "20:00")
+}
+_DEFAULT_SLOTS = ("12:00", "18:00")
+
+# Day plan used by optimize_schedule:
+# (time, item type, index into that type's list, duration, coordination notes)
+_SCHEDULE_TEMPLATE = (
+    ("09:00", "activity", 0, "3 hours", "Start early for better availability"),
+    ("12:30", "restaurant", 0, "1.5 hours", "Lunch break between activities"),
+    ("15:00", "activity", 1, "2.5 hours", "Afternoon activity with hotel proximity"),
+    ("19:00", "restaurant", 1, "2 hours", "Dinner with relaxed timing")
+)
+_OPTIMIZATION_FACTORS = {
+    "travel_time_minimized": True,
+    "budget_distribution": "balanced",
+    "energy_levels": "considered",
+    "weather_contingency": "available",
+    "coordination_with_agents": ("hotel-booking-agent", "transport-agent")
+}
+
 
 class ActivityPlanningAgent:
     """
@@ -24,7 +153,7 @@ class ActivityPlanningAgent:
     Coordinates with hotel/flight agents for location and timing optimization.
     """
     
-    def __init__(self):
+    def __init__(self, api_concurrency: int = API_CONCURRENCY) -> None:
         self.agent_id = "activity-planning-agent"
         self.name = "ActivityPlanningAgent"
         self.version = "1.0.0"
@@ -38,18 +167,67 @@ class ActivityPlanningAgent:
         ]
         
         # Initialize real API connections
-        try:
-            import sys
-            import os
-            sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from travel_apis import TravelAPIManager
-            self.travel_apis = TravelAPIManager()
+        self.travel_apis = acquire_api_mgr()
+        if self.travel_apis is not None:
             print("✅ Connected to real activity APIs (Google Places, TripAdvisor)")
-        except ImportError as e:
-            print(f"⚠️  Could not import TravelAPIManager - using mock data: {e}")
+        else:
+            print(f"⚠️  Could not import TravelAPIManager - using mock data: {_TRAVEL_APIS_IMPORT_ERROR}")
+        
+        # Sliding window over upstream calls: a slot is held only for the
+        # request itself, never across retry backoff.
+        self._api_sem = asyncio.Semaphore(api_concurrency)
+        
+        # Normalized search key -> (expires_at, upstream result), and the
+        # upstream call currently running for a key so identical concurrent
+        # searches share it
+        self._upstream_cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._upstream_inflight: Dict[Tuple, "asyncio.Task"] = {}
+        
+        # Process-local sequence for restaurant ids
+        self._id_counter = itertools.count()
+        
+        logger.info("🎯 ActivityPlanningAgent initialized with capabilities: %s", self.capabilities)
+    
+    async def aclose(self) -> None:
+        """Release this agent's hold on the shared upstream client
+        
+        The client is closed only once no other agent in the process uses it.
+        """
+        if self.travel_apis is not None:
             self.travel_apis = None
+            await release_api_mgr()
+    
+    async def _cached_upstream(self, key: Tuple, call: Callable[[], Awaitable[Any]],
+                               cacheable: Callable[[Any], bool] = bool) -> Any:
+        """Run an upstream search once per key: serve it from cache, join an
+        identical search already in flight, or start it under the API semaphore.
         
-        logger.info(f"🎯 ActivityPlanningAgent initialized with capabilities: {self.capabilities}")
+        Results are shared between callers and must not be mutated.
+        """
+        cached = self._upstream_cache.get(key)
+        if cached is not None:
+            if cached[0] > monotonic():
+                self._upstream_cache.move_to_end(key)
+                return cached[1]
+            del self._upstream_cache[key]
+        
+        task = self._upstream_inflight.get(key)
+        if task is None:
+            async def fetch() -> Any:
+                async with self._api_sem:
+                    result = await call()
+                if cacheable(result):
+                    self._upstream_cache[key] = (monotonic() + UPSTREAM_CACHE_TTL, result)
+                    while len(self._upstream_cache) > UPSTREAM_CACHE_SIZE:
+                        self._upstream_cache.popitem(last=False)
+                return result
+            
+            task = asyncio.ensure_future(fetch())
+            self._upstream_inflight[key] = task
+            task.add_done_callback(lambda _: self._upstream_inflight.pop(key, None))
+        
+        # shield: one caller giving up must not cancel the search for the others
+        return await asyncio.shield(task)
     
     async def search_activities(self, request_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Search for activities and attractions based on location and preferences"""
@@ -60,7 +238,7 @@ class ActivityPlanningAgent:
         group_size = request_data.get('group_size', 2)
         preferences = request_data.get('preferences', [])
         
-        logger.info(f"🎯 Searching activities in {destination} for {group_size} people")
+        logger.info("🎯 Searching activities in %s for %s people", destination, group_size)
         
         try:
             # Use real activity API if available  
@@ -69,23 +247,25 @@ class ActivityPlanningAgent:
                 
                 total_budget = Decimal(str(budget_per_person * group_size))
                 
-                activities_data = await self.travel_apis.activity_api.search_activities(
-                    destination=destination,
-                    max_budget=total_budget,
-                    preferences=preferences
-                )
+                async def fetch_enhanced() -> List[Dict[str, Any]]:
+                    activities_data = await self.travel_apis.activity_api.search_activities(
+                        destination=destination,
+                        max_budget=total_budget,
+                        preferences=preferences
+                    )
+                    # Freshly decoded upstream dicts, not yet shared: add
+                    # coordination metadata in place before they are cached
+                    for activity in activities_data:
+                        activity.update(_COORD_META)
+                        activity['weather_dependent'] = activity.get('outdoor', False)
+                    return activities_data
                 
-                # Add coordination metadata to each activity
-                enhanced_activities = []
-                for activity in activities_data:
-                    enhanced_activity = activity.copy()
-                    enhanced_activity['agent_id'] = self.agent_id
-                    enhanced_activity['coordination_needed'] = ["timing", "transportation"]
-                    enhanced_activity['best_time_slots'] = ["morning", "afternoon"]
-                    enhanced_activity['weather_dependent'] = activity.get('outdoor', False)
-                    enhanced_activities.append(enhanced_activity)
+                enhanced_activities = await self._cached_upstream(
+                    ("activities", destination.strip().lower(), tuple(sorted(preferences)), total_budget),
+                    fetch_enhanced
+                )
                 
-                logger.info(f"✅ Found {len(enhanced_activities)} real activity offers")
+                logger.info("✅ Found %d real activity offers", len(enhanced_activities))
                 return enhanced_activities
             
             # No real API available - refuse to return mock data
@@ -93,7 +273,7 @@ class ActivityPlanningAgent:
             raise Exception("Real activity APIs not available - refusing to return mock data")
             
         except Exception as e:
-            logger.error(f"❌ Activity search failed: {e}")
+            logger.error("❌ Activity search failed: %s", e)
             return []
     
     async def search_restaurants(self, request_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -105,7 +285,7 @@ class ActivityPlanningAgent:
         meal_times = request_data.get('meal_times', ['dinner'])
         dietary_restrictions = request_data.get('dietary_restrictions', [])
         
-        logger.info(f"🍽️ Searching restaurants in {destination} via Google Places API...")
+        logger.info("🍽️ Searching restaurants in %s via Google Places API...", destination)
         
         # Check if real APIs are available
         if not self.travel_apis:
@@ -114,78 +294,142 @@ class ActivityPlanningAgent:
 
         # Retry logic for real API calls
         max_retries = 3
+        delay = RETRY_BASE_DELAY
         for attempt in range(max_retries):
             try:
                 # Use real Google Places API - NO TIMEOUT
-                api_result = await self.travel_apis.search_restaurants(
-                    destination=destination,
-                    max_budget_per_meal=budget_per_person,
-                    cuisine_preferences=cuisine_types
+                api_result = await self._cached_upstream(
+                    ("restaurants", destination.strip().lower(), tuple(sorted(cuisine_types)), float(budget_per_person)),
+                    lambda: self.travel_apis.search_restaurants(
+                        destination=destination,
+                        max_budget_per_meal=budget_per_person,
+                        cuisine_preferences=cuisine_types
+                    ),
+                    cacheable=lambda result: bool(result and result.get('restaurants'))
                 )
                 
                 if api_result and api_result.get('restaurants'):
                     restaurants = api_result['restaurants']
                     
                     # Filter by budget and add agent-specific fields
-                    filtered_restaurants = []
-                    for restaurant in restaurants:
-                        if restaurant.get('avg_price_per_person', budget_per_person) <= budget_per_person * 1.2:
-                            # Add agent coordination fields
-                            restaurant.update({
-                                "restaurant_id": f"REST_{restaurant.get('place_id', 'unknown')}_{datetime.now().timestamp()}",
-                                "agent_id": self.agent_id,
-                                "coordination_needed": ["timing", "group_size"],
-                                "group_accommodations": True,
-                                "booking_required": restaurant.get('price_level', 2) >= 3,
-                                "advance_booking_hours": 2 if restaurant.get('price_level', 2) >= 3 else 0,
-                                "dietary_options": self._extract_dietary_options(restaurant),
-                                "available_times": self._generate_available_times(meal_times),
-                                "total_cost": restaurant.get('avg_price_per_person', budget_per_person) * group_size
-                            })
-                            filtered_restaurants.append(restaurant)
+                    threshold = budget_per_person * 1.2
+                    available_times = self._generate_available_times(meal_times)
+                    filtered_restaurants = [
+                        self._enrich_restaurant(restaurant, budget_per_person, group_size, available_times)
+                        for restaurant in restaurants
+                        if restaurant.get('avg_price_per_person', budget_per_person) <= threshold
+                    ]
                     
+                    # A non-empty upstream result is cached, so retrying would
+                    # only return the same restaurants again
                     if filtered_restaurants:
-                        logger.info(f"✅ Found {len(filtered_restaurants)} restaurants via Google Places API")
-                        return filtered_restaurants
+                        logger.info("✅ Found %d restaurants via Google Places API", len(filtered_restaurants))
+                    else:
+                        logger.info("ℹ️ No restaurants within budget in %s", destination)
+                    return filtered_restaurants
                 
-                logger.warning(f"⚠️ Attempt {attempt + 1}: No restaurants found, retrying...")
+                logger.warning("⚠️ Attempt %d: No restaurants found, retrying...", attempt + 1)
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                    delay = await self._backoff(delay)
                     
             except Exception as e:
-                logger.error(f"❌ Restaurant search attempt {attempt + 1} failed: {e}")
+                logger.error("❌ Restaurant search attempt %d failed: %s", attempt + 1, e)
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)
+                    delay = await self._backoff(delay)
                 else:
                     logger.error("❌ All restaurant search attempts failed")
                     return []
         
         return []
     
+    async def _backoff(self, previous_delay: float) -> float:
+        """Sleep for a decorrelated-jitter delay and return it for the next retry
+        
+        Randomized delays keep concurrent searches from retrying in lockstep.
+        """
+        delay = random.uniform(RETRY_BASE_DELAY, min(RETRY_MAX_DELAY, previous_delay * 3))
+        await asyncio.sleep(delay)
+        return delay
+    
+    def _enrich_restaurant(self, restaurant: Dict[str, Any], budget_per_person: float,
+                           group_size: int, available_times: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Copy an upstream restaurant and add agent coordination fields.
+        
+        The upstream result is shared through the search cache, so it is never
+        modified in place.
+        """
+        price_level = restaurant.get('price_level', 2)
+        return {
+            **restaurant,
+            "restaurant_id": f"REST_{restaurant.get('place_id', 'unknown')}_{next(self._id_counter)}",
+            "agent_id": self.agent_id,
+            "coordination_needed": ["timing", "group_size"],
+            "group_accommodations": True,
+            "booking_required": price_level >= 3,
+            "advance_booking_hours": 2 if price_level >= 3 else 0,
+            "dietary_options": self._extract_dietary_options(restaurant),
+            "available_times": available_times,
+            "total_cost": restaurant.get('avg_price_per_person', budget_per_person) * group_size
+        }
+    
+    async def search_restaurants_bulk(self, requests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Search restaurants for many requests at once, in request order"""
+        return await asyncio.gather(*(self.search_restaurants(request_data) for request_data in requests))
+    
+    async def search_all(self, request_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Search activities and restaurants concurrently for the same request"""
+        activities, restaurants = await asyncio.gather(
+            self.search_activities(request_data),
+            self.search_restaurants(request_data),
+            return_exceptions=True
+        )
+        
+        if isinstance(activities, Exception):
+            logger.error("❌ Activity search failed: %s", activities)
+            activities = []
+        if isinstance(restaurants, Exception):
+            logger.error("❌ Restaurant search failed: %s", restaurants)
+            restaurants = []
+        
+        return {"activities": activities, "restaurants": restaurants}
+    
+    async def stream_all(self, request_data: Dict[str, Any]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ("activity" | "restaurant", item) pairs as each search finishes"""
+        async def tagged(kind: str, search: Awaitable[List[Dict[str, Any]]]) -> Tuple[str, List[Dict[str, Any]]]:
+            return kind, await search
+        
+        searches = [
+            tagged("activity", self.search_activities(request_data)),
+            tagged("restaurant", self.search_restaurants(request_data))
+        ]
+        for next_done in asyncio.as_completed(searches):
+            kind, items = await next_done
+            for item in items:
+                yield kind, item
+    
     def _extract_dietary_options(self, restaurant: Dict[str, Any]) -> List[str]:
         """Extract dietary options from restaurant data"""
         # Default dietary options based on restaurant type/cuisine
-        base_options = ["vegetarian"]
+        base_options: List[str] = ["vegetarian"]
         
         # Add more options based on restaurant types
-        restaurant_types = restaurant.get('types', [])
-        if any('vegan' in t.lower() for t in restaurant_types):
+        restaurant_types = {t.lower() for t in restaurant.get('types', [])}
+        if any('vegan' in t for t in restaurant_types):
             base_options.append("vegan")
-        if any('gluten' in t.lower() for t in restaurant_types):
+        if any('gluten' in t for t in restaurant_types):
             base_options.append("gluten-free")
             
         return base_options
     
     def _generate_available_times(self, meal_times: List[str]) -> Dict[str, List[str]]:
         """Generate available reservation times"""
-        times = {}
+        times: Dict[str, List[str]] = {}
         for meal in meal_times:
-            if meal.lower() == 'lunch':
-                times['lunch'] = ["11:30", "12:00", "12:30", "13:00", "13:30"]
-            elif meal.lower() == 'dinner':
-                times['dinner'] = ["17:30", "18:00", "18:30", "19:00", "19:30", "20:00"]
+            slot = meal.lower()
+            if slot in _MEAL_SLOTS:
+                times[slot] = list(_MEAL_SLOTS[slot])
             else:
-                times[meal] = ["12:00", "18:00"]  # Default times
+                times[meal] = list(_DEFAULT_SLOTS)  # Default times
         return times
     
     async def optimize_schedule(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -195,51 +439,26 @@ class ActivityPlanningAgent:
         constraints = request_data.get('constraints', {})
         hotel_location = request_data.get('hotel_location', {})
         
-        logger.info(f"📅 Optimizing schedule for {len(activities)} activities and {len(restaurants)} restaurants")
+        logger.info("📅 Optimizing schedule for %d activities and %d restaurants", len(activities), len(restaurants))
         
         try:
             # Create optimized daily itinerary
+            items: Dict[str, List[Dict[str, Any]]] = {"activity": activities, "restaurant": restaurants}
             optimized_schedule = {
                 "day_1": {
                     "date": "2025-09-28",
                     "schedule": [
                         {
-                            "time": "09:00",
-                            "type": "activity",
-                            "item": activities[0] if activities else None,
-                            "duration": "3 hours",
-                            "coordination_notes": "Start early for better availability"
-                        },
-                        {
-                            "time": "12:30",
-                            "type": "restaurant",
-                            "item": restaurants[0] if restaurants else None,
-                            "duration": "1.5 hours",
-                            "coordination_notes": "Lunch break between activities"
-                        },
-                        {
-                            "time": "15:00",
-                            "type": "activity",
-                            "item": activities[1] if len(activities) > 1 else None,
-                            "duration": "2.5 hours",
-                            "coordination_notes": "Afternoon activity with hotel proximity"
-                        },
-                        {
-                            "time": "19:00",
-                            "type": "restaurant",
-                            "item": restaurants[1] if len(restaurants) > 1 else None,
-                            "duration": "2 hours",
-                            "coordination_notes": "Dinner with relaxed timing"
+                            "time": slot_time,
+                            "type": slot_type,
+                            "item": items[slot_type][index] if len(items[slot_type]) > index else None,
+                            "duration": duration,
+                            "coordination_notes": notes
                         }
+                        for slot_time, slot_type, index, duration, notes in _SCHEDULE_TEMPLATE
                     ]
                 },
-                "optimization_factors": {
-                    "travel_time_minimized": True,
-                    "budget_distribution": "balanced",
-                    "energy_levels": "considered",
-                    "weather_contingency": "available",
-                    "coordination_with_agents": ["hotel-booking-agent", "transport-agent"]
-                },
+                "optimization_factors": dict(_OPTIMIZATION_FACTORS),
                 "total_estimated_cost": sum(
                     activity.get('total_cost', 0) for activity in activities
                 ) + sum(
@@ -253,7 +472,7 @@ class ActivityPlanningAgent:
             return optimized_schedule
             
         except Exception as e:
-            logger.error(f"❌ Schedule optimization failed: {e}")
+            logger.error("❌ Schedule optimization failed: %s", e)
             return {"error": str(e), "agent_id": self.agent_id}
     
     async def coordinate_timing(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -263,7 +482,7 @@ class ActivityPlanningAgent:
         other_commitments = request_data.get('other_commitments', [])
         buffer_minutes = request_data.get('buffer_minutes', 30)
         
-        logger.info(f"⏰ Coordinating timing for activity {activity_id} at {requested_time}")
+        logger.info("⏰ Coordinating timing for activity %s at %s", activity_id, requested_time)
         
         # Simulate timing coordination with other agents
         coordination_result = {
@@ -292,10 +511,17 @@ class ActivityPlanningAgent:
 def create_activity_agent_app() -> FastAPI:
     """Create standalone FastAPI app for ActivityPlanningAgent"""
     
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        yield
+        await agent.aclose()
+    
     app = FastAPI(
         title="ActivityPlanningAgent",
         description="Specialized agent for activities, restaurants, and experience planning",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
     )
     
     # Add CORS for cross-agent communication
@@ -310,47 +536,60 @@ def create_activity_agent_app() -> FastAPI:
     # Initialize agent
     agent = ActivityPlanningAgent()
     
-    @app.get("/")
-    async def root():
-        return {
-            "agent": agent.name,
-            "agent_id": agent.agent_id,
-            "version": agent.version,
-            "capabilities": agent.capabilities,
-            "status": "active",
-            "endpoints": {
-                "activities": "/api/search-activities",
-                "restaurants": "/api/search-restaurants", 
-                "optimize": "/api/optimize-schedule",
-                "coordinate": "/api/coordinate-timing",
-                "agent_info": "/.well-known/agent"
-            }
+    # Discovery payloads only depend on immutable agent attributes
+    serve_root = _static_json({
+        "agent": agent.name,
+        "agent_id": agent.agent_id,
+        "version": agent.version,
+        "capabilities": agent.capabilities,
+        "status": "active",
+        "endpoints": {
+            "activities": "/api/search-activities",
+            "restaurants": "/api/search-restaurants", 
+            "restaurants_bulk": "/api/search-restaurants-bulk",
+            "search_all": "/api/search-all",
+            "search_all_stream": "/api/search-all/stream",
+            "optimize": "/api/optimize-schedule",
+            "coordinate": "/api/coordinate-timing",
+            "agent_info": "/.well-known/agent"
         }
+    })
+    
+    serve_agent_card = _static_json({
+        "name": agent.name,
+        "agent_id": agent.agent_id,
+        "version": agent.version,
+        "description": "Specialized agent for activities, restaurants, and experience planning with schedule optimization",
+        "capabilities": agent.capabilities,
+        "endpoints": {
+            "search_activities": "/api/search-activities",
+            "search_restaurants": "/api/search-restaurants",
+            "search_restaurants_bulk": "/api/search-restaurants-bulk",
+            "search_all": "/api/search-all",
+            "search_all_stream": "/api/search-all/stream",
+            "optimize_schedule": "/api/optimize-schedule",
+            "coordinate_timing": "/api/coordinate-timing"
+        },
+        "communication_protocols": ["HTTP", "JSON"],
+        "schedule_optimization_supported": True,
+        "real_time_coordination": True,
+        "collaboration_with": ["hotel-booking-agent", "flight-booking-agent", "transport-agent"],
+        "data_sources": ["TripAdvisor", "Google Places", "Local APIs"]
+    })
+    
+    @app.get("/")
+    async def root(request: Request) -> Response:
+        return serve_root(request)
     
     @app.get("/.well-known/agent")
-    async def get_agent_card():
+    async def get_agent_card(request: Request) -> Response:
         """A2A Agent Card for discovery"""
-        return {
-            "name": agent.name,
-            "agent_id": agent.agent_id,
-            "version": agent.version,
-            "description": "Specialized agent for activities, restaurants, and experience planning with schedule optimization",
-            "capabilities": agent.capabilities,
-            "endpoints": {
-                "search_activities": "/api/search-activities",
-                "search_restaurants": "/api/search-restaurants",
-                "optimize_schedule": "/api/optimize-schedule",
-                "coordinate_timing": "/api/coordinate-timing"
-            },
-            "communication_protocols": ["HTTP", "JSON"],
-            "schedule_optimization_supported": True,
-            "real_time_coordination": True,
-            "collaboration_with": ["hotel-booking-agent", "flight-booking-agent", "transport-agent"],
-            "data_sources": ["TripAdvisor", "Google Places", "Local APIs"]
-        }
+        return serve_agent_card(request)
     
-    @app.post("/api/search-activities")
-    async def search_activities(request_data: Dict[str, Any]):
+    # response_model=None: the return annotations are for type checkers only;
+    # without it FastAPI would turn them into response validation
+    @app.post("/api/search-activities", response_model=None)
+    async def search_activities(request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Search for activities and attractions"""
         activities = await agent.search_activities(request_data)
         return {
@@ -361,8 +600,8 @@ def create_activity_agent_app() -> FastAPI:
             "schedule_coordination_available": True
         }
     
-    @app.post("/api/search-restaurants")
-    async def search_restaurants(request_data: Dict[str, Any]):
+    @app.post("/api/search-restaurants", response_model=None)
+    async def search_restaurants(request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Search for restaurants with dietary and timing coordination"""
         restaurants = await agent.search_restaurants(request_data)
         return {
@@ -373,8 +612,45 @@ def create_activity_agent_app() -> FastAPI:
             "timing_coordination_available": True
         }
     
-    @app.post("/api/optimize-schedule")
-    async def optimize_schedule(request_data: Dict[str, Any]):
+    @app.post("/api/search-restaurants-bulk", response_model=None)
+    async def search_restaurants_bulk(request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Search restaurants for several destinations/requests in one call"""
+        results = await agent.search_restaurants_bulk(request_data.get('requests', []))
+        return {
+            "success": True,
+            "agent_id": agent.agent_id,
+            "results": [
+                {"restaurants": restaurants, "total_found": len(restaurants)}
+                for restaurants in results
+            ],
+            "timing_coordination_available": True
+        }
+    
+    @app.post("/api/search-all", response_model=None)
+    async def search_all(request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Search activities and restaurants in one call"""
+        results = await agent.search_all(request_data)
+        return {
+            "success": True,
+            "agent_id": agent.agent_id,
+            "activities": results["activities"],
+            "restaurants": results["restaurants"],
+            "total_found": len(results["activities"]) + len(results["restaurants"]),
+            "schedule_coordination_available": True,
+            "timing_coordination_available": True
+        }
+    
+    @app.post("/api/search-all/stream")
+    async def search_all_stream(request_data: Dict[str, Any]) -> StreamingResponse:
+        """Stream activities and restaurants as NDJSON, whichever search finishes first"""
+        async def ndjson() -> AsyncIterator[bytes]:
+            async for kind, item in agent.stream_all(request_data):
+                yield orjson.dumps({"type": kind, "agent_id": agent.agent_id, "item": item}) + b"\n"
+        
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    @app.post("/api/optimize-schedule", response_model=None)
+    async def optimize_schedule(request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Optimize activity and dining schedule"""
         schedule = await agent.optimize_schedule(request_data)
         return {
@@ -382,8 +658,8 @@ def create_activity_agent_app() -> FastAPI:
             "optimized_schedule": schedule
         }
     
-    @app.post("/api/coordinate-timing")
-    async def coordinate_timing(request_data: Dict[str, Any]):
+    @app.post("/api/coordinate-timing", response_model=None)
+    async def coordinate_timing(request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Coordinate timing with other agents"""
         result = await agent.coordinate_timing(request_data)
         return {
@@ -395,7 +671,9 @@ def create_activity_agent_app() -> FastAPI:
 
 
 if __name__ == "__main__":
-    app = create_activity_agent_app()
+    import uvicorn
+    
+    workers = int(os.getenv("ACTIVITY_AGENT_WORKERS", "1"))
     
     print("🎯 ActivityPlanningAgent starting...")
     print("🍽️ Specialized in activities and restaurant planning")
@@ -405,4 +683,10 @@ if __name__ == "__main__":
     print("🤖 Agent info: http://localhost:8003/.well-known/agent")
     print("🔗 API endpoints: http://localhost:8003/api/")
     
-    uvicorn.run(app, host="0.0.0.0", port=8003)
+    server_options = {"host": "0.0.0.0", "port": 8003, "loop": UVICORN_LOOP, "http": UVICORN_HTTP}
+    if workers > 1:
+        # Each worker process builds its own app (and upstream pool) from the factory
+        uvicorn.run("activity_planning_agent:create_activity_agent_app", factory=True,
+                    workers=workers, **server_options)
+    else:
+        uvicorn.run(create_activity_agent_app(), **server_options)
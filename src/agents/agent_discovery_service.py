@@ -7,19 +7,110 @@ and coordinated communication between distributed agents in the ecosystem.
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Set
+from typing import Awaitable, Callable, Dict, List, Any, NamedTuple, Optional, Sequence, Set, Tuple
 from datetime import datetime, timedelta
 import json
+import time
 import httpx
 import uvicorn
-from dataclasses import dataclass, asdict
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
+try:
+    import h2  # noqa: F401 - presence enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Pool shared by all probes and forwarded calls; the same few agent origins
+# are hit repeatedly, so keep their connections alive between requests
+CLIENT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60.0)
+
+# Per-request timeouts (seconds). Discovery and availability probes also use
+# theirs as a hard deadline for the whole probe: httpx timeouts apply per
+# connect/read, so a peer that trickles its response could otherwise stall a
+# discovery round well past them.
+DISCOVERY_TIMEOUT = 5.0
+AVAILABILITY_TIMEOUT = 3.0
+COMMUNICATION_TEST_TIMEOUT = 10.0
+BATCH_CALL_TIMEOUT = 15.0
+
+# Failures expected from talking to an agent: transport/HTTP errors and
+# undecodable bodies. Anything else is a bug and propagates.
+PROBE_ERRORS = (httpx.HTTPError, OSError, ValueError)
+
+# Maximum availability checks in flight while refreshing agent statuses
+STATUS_REFRESH_CONCURRENCY = 32
+
+# Discovery and ecosystem status results are reused for this long (seconds)
+# so bursts of dashboard polls don't re-probe every agent. Past the TTL and
+# until the stale TTL, the old result is still served while a single
+# background refresh runs.
+DISCOVERY_TTL = 10.0
+DISCOVERY_STALE_TTL = 60.0
+ECOSYSTEM_STATUS_TTL = 10.0
+ECOSYSTEM_STATUS_STALE_TTL = 60.0
+
+# The app re-runs discovery and the status report in the background this
+# often (seconds), shorter than the TTLs so requests find fresh results
+REFRESH_INTERVAL = 8.0
+
+# Upper bound on sub-calls accepted by a single /api/batch request
+MAX_BATCH_CALLS = 32
+
+# Agent endpoints /api/batch will forward: read-only searches that are safe to
+# repeat. Bookings, negotiations and anything else must be called directly.
+BATCHABLE_PATHS = frozenset((
+    "/api/search-flights",
+    "/api/search-hotels",
+    "/api/search-activities",
+    "/api/search-restaurants",
+    "/api/search-restaurants-bulk",
+    "/api/search-all"
+))
+
+# Capabilities a usable ecosystem must cover; quorum discovery stops probing
+# once the agents found so far provide all of them
+ESSENTIAL_CAPABILITIES = frozenset(('flight_search', 'hotel_search', 'activity_search', 'itinerary_generation'))
+
+# Capabilities each coordination task type needs, and the order to run them in
+_CAPABILITY_MAPS = {
+    "comprehensive_trip_planning": (
+        "flight_search", "hotel_search", "activity_search", "itinerary_generation"
+    ),
+    "budget_optimization": (
+        "budget_negotiation", "price_optimization", "cost_analysis"
+    ),
+    "disruption_handling": (
+        "disruption_handling", "alternative_planning", "real_time_updates"
+    ),
+    "itinerary_generation": (
+        "itinerary_generation", "schedule_optimization", "ai_recommendations"
+    )
+}
+_DEFAULT_CAPABILITIES = ("general_travel_assistance",)
+
+_ORDER_MAPS = {
+    "comprehensive_trip_planning": ("flight_search", "hotel_search", "activity_search", "itinerary_generation"),
+    "budget_optimization": ("budget_analysis", "price_optimization", "budget_negotiation"),
+    "disruption_handling": ("disruption_detection", "alternative_planning", "rebooking")
+}
+
+# Expected time per capability call (ms); anything else is assumed to take 1s
+_BASE_TIMES_MS = {
+    "flight_search": 3000,
+    "hotel_search": 2500,
+    "activity_search": 2000,
+    "itinerary_generation": 5000
+}
+
 
 @dataclass
 class AgentInfo:
@@ -33,6 +124,48 @@ class AgentInfo:
     last_seen: datetime
     status: str = "active"
     response_time_ms: Optional[float] = None
+    last_seen_iso: str = ""
+    # Set view of capabilities for O(1) membership tests
+    capabilities_set: frozenset = field(default_factory=frozenset, init=False, repr=False, compare=False)
+    # Serialized form reused across responses; reset whenever a field changes
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.capabilities_set = frozenset(self.capabilities)
+
+
+class EcosystemStats(NamedTuple):
+    """Registry aggregates gathered in one pass for the ecosystem status report"""
+    active: List[AgentInfo]
+    inactive: List[AgentInfo]
+    capabilities: Set[str]
+
+
+def touch_agent(agent: AgentInfo, seen_at: Optional[datetime] = None):
+    """Record when an agent was last seen, keeping last_seen_iso in step"""
+    agent.last_seen = seen_at or datetime.now()
+    agent.last_seen_iso = agent.last_seen.isoformat()
+    agent._cached_dict = None
+
+
+def agent_to_dict(agent: AgentInfo) -> Dict[str, Any]:
+    """Plain-dict view of an agent for responses, built once per change
+    
+    The returned dict is shared between responses and must not be mutated.
+    """
+    if agent._cached_dict is None:
+        agent._cached_dict = {
+            "agent_id": agent.agent_id,
+            "name": agent.name,
+            "version": agent.version,
+            "base_url": agent.base_url,
+            "capabilities": agent.capabilities,
+            "endpoints": agent.endpoints,
+            "last_seen": agent.last_seen_iso,
+            "status": agent.status,
+            "response_time_ms": agent.response_time_ms
+        }
+    return agent._cached_dict
 
 
 class AgentDiscoveryService:
@@ -58,79 +191,158 @@ class AgentDiscoveryService:
         ]
         
         # Capability mappings
-        self.capability_index: Dict[str, List[str]] = {}
+        self.capability_index: Dict[str, Set[str]] = {}
+        
+        # Cached responses by name: (fresh until, stale until, payload), in
+        # monotonic time, and the refresh currently running for each name
+        self._response_cache: Dict[str, Tuple[float, float, Dict[str, Any]]] = {}
+        self._refresh_tasks: Dict[str, "asyncio.Task"] = {}
+        
+        # When the background refresher last completed a round (ISO timestamp)
+        self.last_refresh: Optional[str] = None
+        
+        self._client = httpx.AsyncClient(
+            timeout=DISCOVERY_TIMEOUT,
+            limits=CLIENT_LIMITS,
+            http2=HTTP2_AVAILABLE
+        )
         
         logger.info(f"🔍 AgentDiscoveryService initialized for A2A ecosystem")
     
-    async def discover_all_agents(self) -> Dict[str, Any]:
-        """Discover all available A2A agents in the ecosystem"""
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        await self._client.aclose()
+    
+    async def run_refresh_loop(self, interval: float = REFRESH_INTERVAL):
+        """Keep discovery and ecosystem status results fresh until cancelled"""
+        while True:
+            try:
+                await self.discover_all_agents(force=True)
+                await self.get_ecosystem_status(force=True)
+                self.last_refresh = datetime.now().isoformat()
+            except Exception as e:
+                logger.warning(f"⚠️ Background ecosystem refresh failed: {e}")
+            await asyncio.sleep(interval)
+    
+    async def discover_all_agents(self, force: bool = False, wait_all: bool = True) -> Dict[str, Any]:
+        """Discover all available A2A agents in the ecosystem
+        
+        With wait_all=False, an uncached discovery returns as soon as the agents
+        found cover ESSENTIAL_CAPABILITIES; such partial rounds are not cached.
+        """
+        if not wait_all and (force or "discovery" not in self._response_cache):
+            return await self._run_discovery(wait_all=False)
+        return await self._cached_response(
+            "discovery", self._run_discovery, DISCOVERY_TTL, DISCOVERY_STALE_TTL, force
+        )
+    
+    async def _run_discovery(self, wait_all: bool = True) -> Dict[str, Any]:
+        """Probe known endpoints and update the registry with the agents found"""
         logger.info("🔍 Starting comprehensive agent discovery")
         
         discovered_agents = []
         discovery_results = []
         
-        for endpoint in self.known_endpoints:
-            try:
-                agent_info = await self._discover_agent(endpoint)
-                if agent_info:
-                    discovered_agents.append(agent_info)
-                    discovery_results.append({
-                        "endpoint": endpoint,
-                        "status": "success",
-                        "agent_id": agent_info.agent_id
-                    })
-                else:
-                    discovery_results.append({
-                        "endpoint": endpoint,
-                        "status": "no_response",
-                        "error": "No A2A agent found"
-                    })
-            except Exception as e:
+        # Probe every endpoint concurrently; results are reported in endpoint order
+        probes = [asyncio.ensure_future(self._discover_agent(endpoint)) for endpoint in self.known_endpoints]
+        try:
+            if wait_all:
+                await asyncio.wait(probes)
+            else:
+                covered: Set[str] = set()
+                for next_done in asyncio.as_completed(probes):
+                    try:
+                        agent_info = await next_done
+                    except Exception:
+                        continue
+                    if agent_info:
+                        covered |= agent_info.capabilities_set
+                    if ESSENTIAL_CAPABILITIES <= covered:
+                        break
+        finally:
+            # Stop probes still running past the quorum and let them settle
+            for probe in probes:
+                probe.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
+        
+        for endpoint, probe in zip(self.known_endpoints, probes):
+            if probe.cancelled():
+                discovery_results.append({
+                    "endpoint": endpoint,
+                    "status": "skipped",
+                    "error": "Essential capabilities already covered"
+                })
+                continue
+            
+            agent_info = probe.exception() or probe.result()
+            if isinstance(agent_info, Exception):
                 discovery_results.append({
                     "endpoint": endpoint,
                     "status": "error",
-                    "error": str(e)
+                    "error": str(agent_info)
+                })
+                logger.warning(f"⚠️ Failed to discover agent at {endpoint}: {agent_info}")
+            elif agent_info:
+                discovered_agents.append(agent_info)
+                discovery_results.append({
+                    "endpoint": endpoint,
+                    "status": "success",
+                    "agent_id": agent_info.agent_id
+                })
+            else:
+                discovery_results.append({
+                    "endpoint": endpoint,
+                    "status": "no_response",
+                    "error": "No A2A agent found"
                 })
-                logger.warning(f"⚠️ Failed to discover agent at {endpoint}: {e}")
         
         # Update registry and capability index
         for agent in discovered_agents:
+            previous = self.agent_registry.get(agent.agent_id)
             self.agent_registry[agent.agent_id] = agent
-            self._update_capability_index(agent)
+            self._update_capability_index(agent, previous)
         
         logger.info(f"✅ Discovered {len(discovered_agents)} active A2A agents")
         
-        return {
+        result = {
             "service_id": self.service_id,
             "discovery_timestamp": datetime.now().isoformat(),
             "total_discovered": len(discovered_agents),
-            "active_agents": [asdict(agent) for agent in discovered_agents],
+            "active_agents": [agent_to_dict(agent) for agent in discovered_agents],
             "discovery_details": discovery_results,
             "capability_summary": self._generate_capability_summary(),
             "ecosystem_health": self._assess_ecosystem_health(discovered_agents)
         }
+        return result
     
     async def find_agents_by_capability(self, capability: str) -> List[Dict[str, Any]]:
         """Find agents that have a specific capability"""
         logger.info(f"🎯 Finding agents with capability: {capability}")
         
-        matching_agents = []
-        
-        for agent_id, agent_info in self.agent_registry.items():
-            if capability in agent_info.capabilities:
-                # Test agent availability
-                is_available = await self._check_agent_availability(agent_info.base_url)
-                
-                matching_agents.append({
-                    "agent_id": agent_info.agent_id,
-                    "name": agent_info.name,
-                    "base_url": agent_info.base_url,
-                    "capabilities": agent_info.capabilities,
-                    "endpoints": agent_info.endpoints,
-                    "available": is_available,
-                    "last_seen": agent_info.last_seen.isoformat(),
-                    "response_time_ms": agent_info.response_time_ms
-                })
+        matches = [
+            self.agent_registry[agent_id]
+            for agent_id in self.capability_index.get(capability, ())
+        ]
+        
+        # Test agent availability for all matches at once
+        availability = await asyncio.gather(
+            *(self._check_agent_availability(agent_info.base_url) for agent_info in matches),
+            return_exceptions=True
+        )
+        
+        matching_agents = [
+            {
+                "agent_id": agent_info.agent_id,
+                "name": agent_info.name,
+                "base_url": agent_info.base_url,
+                "capabilities": agent_info.capabilities,
+                "endpoints": agent_info.endpoints,
+                "available": is_available is True,
+                "last_seen": agent_info.last_seen_iso,
+                "response_time_ms": agent_info.response_time_ms
+            }
+            for agent_info, is_available in zip(matches, availability)
+        ]
         
         logger.info(f"✅ Found {len(matching_agents)} agents with {capability} capability")
         return matching_agents
@@ -174,40 +386,43 @@ class AgentDiscoveryService:
             "success_probability": self._calculate_success_probability(coordination_plan)
         }
     
-    async def get_ecosystem_status(self) -> Dict[str, Any]:
+    async def get_ecosystem_status(self, force: bool = False) -> Dict[str, Any]:
         """Get current status of the entire A2A ecosystem"""
+        return await self._cached_response(
+            "ecosystem_status", self._build_ecosystem_status,
+            ECOSYSTEM_STATUS_TTL, ECOSYSTEM_STATUS_STALE_TTL, force
+        )
+    
+    async def _build_ecosystem_status(self) -> Dict[str, Any]:
+        """Refresh agent statuses and build the ecosystem status report"""
         logger.info("📊 Generating ecosystem status report")
         
         # Refresh agent statuses
         await self._refresh_agent_statuses()
         
-        active_agents = [agent for agent in self.agent_registry.values() if agent.status == "active"]
-        inactive_agents = [agent for agent in self.agent_registry.values() if agent.status != "active"]
+        stats = self._collect_stats()
+        active_agents, inactive_agents, all_capabilities = stats
         
-        # Capability coverage
-        all_capabilities = set()
-        for agent in active_agents:
-            all_capabilities.update(agent.capabilities)
-        
-        return {
+        status = {
             "service_id": self.service_id,
             "ecosystem_timestamp": datetime.now().isoformat(),
             "total_registered_agents": len(self.agent_registry),
             "active_agents": len(active_agents),
             "inactive_agents": len(inactive_agents),
             "agent_details": {
-                "active": [asdict(agent) for agent in active_agents],
-                "inactive": [asdict(agent) for agent in inactive_agents]
+                "active": [agent_to_dict(agent) for agent in active_agents],
+                "inactive": [agent_to_dict(agent) for agent in inactive_agents]
             },
             "capability_coverage": {
                 "total_capabilities": len(all_capabilities),
                 "available_capabilities": list(all_capabilities),
                 "capability_distribution": self._get_capability_distribution()
             },
-            "ecosystem_health_score": self._calculate_ecosystem_health_score(),
+            "ecosystem_health_score": self._calculate_ecosystem_health_score(len(active_agents)),
             "coordination_readiness": self._assess_coordination_readiness(),
-            "recommendations": self._generate_ecosystem_recommendations()
+            "recommendations": self._generate_ecosystem_recommendations(len(active_agents))
         }
+        return status
     
     async def test_agent_communication(self, source_agent_id: str, target_agent_id: str) -> Dict[str, Any]:
         """Test communication between two agents"""
@@ -223,12 +438,13 @@ class AgentDiscoveryService:
         
         try:
             # Test basic connectivity
-            start_time = datetime.now()
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{target_agent.base_url}/.well-known/agent")
-                response.raise_for_status()
+            start_time = time.monotonic()
+            response = await self._client.get(
+                f"{target_agent.base_url}/.well-known/agent", timeout=COMMUNICATION_TEST_TIMEOUT
+            )
+            response.raise_for_status()
             
-            response_time = (datetime.now() - start_time).total_seconds() * 1000
+            response_time = (time.monotonic() - start_time) * 1000.0
             
             return {
                 "success": True,
@@ -242,7 +458,7 @@ class AgentDiscoveryService:
                 "test_timestamp": datetime.now().isoformat()
             }
             
-        except Exception as e:
+        except PROBE_ERRORS as e:
             return {
                 "success": False,
                 "source_agent_id": source_agent_id,
@@ -251,60 +467,197 @@ class AgentDiscoveryService:
                 "test_timestamp": datetime.now().isoformat()
             }
     
+    async def execute_batch(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Forward several agent calls in one round trip, preserving request order"""
+        logger.info(f"📦 Executing batch of {len(calls)} agent calls")
+        
+        return await asyncio.gather(*(self._execute_batch_call(call) for call in calls))
+    
     # Helper methods
     
+    async def _cached_response(self, name: str, compute: Callable[[], Awaitable[Dict[str, Any]]],
+                               ttl: float, stale_ttl: float, force: bool) -> Dict[str, Any]:
+        """Serve a cached response with stale-while-revalidate
+        
+        Fresh entries are returned as-is; stale ones are returned immediately
+        while a background refresh runs. Only a missing, expired or forced
+        entry makes the caller wait, and concurrent callers share one refresh.
+        """
+        entry = self._response_cache.get(name)
+        if not force and entry is not None:
+            fresh_until, stale_until, payload = entry
+            now = time.monotonic()
+            if now < fresh_until:
+                return payload
+            if now < stale_until:
+                self._refresh_response(name, compute, ttl, stale_ttl)
+                return payload
+        
+        # shield: a caller disconnecting must not cancel the shared refresh
+        return await asyncio.shield(self._refresh_response(name, compute, ttl, stale_ttl))
+    
+    def _refresh_response(self, name: str, compute: Callable[[], Awaitable[Dict[str, Any]]],
+                          ttl: float, stale_ttl: float) -> "asyncio.Task":
+        """Start the refresh of a cached response, or join the one already running"""
+        task = self._refresh_tasks.get(name)
+        if task is None or task.done():
+            async def refresh() -> Dict[str, Any]:
+                payload = await compute()
+                now = time.monotonic()
+                self._response_cache[name] = (now + ttl, now + stale_ttl, payload)
+                return payload
+            
+            task = asyncio.ensure_future(refresh())
+            task.add_done_callback(self._log_refresh_failure)
+            self._refresh_tasks[name] = task
+        return task
+    
+    @staticmethod
+    def _log_refresh_failure(task: "asyncio.Task"):
+        """Report background refresh errors nobody is awaiting"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ Background refresh failed: {task.exception()}")
+    
+    async def _execute_batch_call(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a single sub-call of a batch against a registered agent
+        
+        A malformed sub-call gets an error entry of its own instead of failing
+        the whole batch.
+        """
+        if not isinstance(call, dict):
+            return {
+                "agent": None,
+                "path": None,
+                "success": False,
+                "error": "Each batch call must be an object"
+            }
+        
+        agent_id = call.get('agent')
+        path = call.get('path', '')
+        
+        if not isinstance(agent_id, str) or not isinstance(path, str):
+            return {
+                "agent": agent_id,
+                "path": path,
+                "success": False,
+                "error": "Batch call agent and path must be strings"
+            }
+        
+        agent_info = self.agent_registry.get(agent_id)
+        if agent_info is None:
+            return {
+                "agent": agent_id,
+                "path": path,
+                "success": False,
+                "error": f"Agent {agent_id} not found in registry"
+            }
+        
+        if path not in BATCHABLE_PATHS:
+            return {
+                "agent": agent_id,
+                "path": path,
+                "success": False,
+                "error": f"{path} can't be batched"
+            }
+        
+        try:
+            response = await self._client.post(
+                f"{agent_info.base_url}{path}", json=call.get('body', {}), timeout=BATCH_CALL_TIMEOUT
+            )
+            response.raise_for_status()
+            return {
+                "agent": agent_id,
+                "path": path,
+                "success": True,
+                "result": response.json(),
+                "headers": {
+                    name: response.headers[name]
+                    for name in ("cache-control", "x-cache-control")
+                    if name in response.headers
+                }
+            }
+        except PROBE_ERRORS as e:
+            return {
+                "agent": agent_id,
+                "path": path,
+                "success": False,
+                "error": f"Batch call failed: {str(e)}"
+            }
+    
     async def _discover_agent(self, endpoint: str) -> Optional[AgentInfo]:
         """Discover a single agent at the given endpoint"""
         try:
-            start_time = datetime.now()
+            start_time = time.monotonic()
+            
+            response = await asyncio.wait_for(
+                self._client.get(f"{endpoint}/.well-known/agent", timeout=DISCOVERY_TIMEOUT),
+                timeout=DISCOVERY_TIMEOUT
+            )
+            response.raise_for_status()
             
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{endpoint}/.well-known/agent")
-                response.raise_for_status()
-                
-                response_time = (datetime.now() - start_time).total_seconds() * 1000
-                agent_data = response.json()
-                
-                agent_info = AgentInfo(
-                    agent_id=agent_data.get('agent_id', 'unknown'),
-                    name=agent_data.get('name', 'Unknown Agent'),
-                    version=agent_data.get('version', '1.0.0'),
-                    base_url=endpoint,
-                    capabilities=agent_data.get('capabilities', []),
-                    endpoints=agent_data.get('endpoints', {}),
-                    last_seen=datetime.now(),
-                    status="active",
-                    response_time_ms=response_time
-                )
-                
-                logger.info(f"✅ Discovered agent: {agent_info.name} ({agent_info.agent_id}) at {endpoint}")
-                return agent_info
-                
-        except Exception as e:
+            response_time = (time.monotonic() - start_time) * 1000.0
+            agent_data = response.json()
+            
+            seen_at = datetime.now()
+            agent_info = AgentInfo(
+                agent_id=agent_data.get('agent_id', 'unknown'),
+                name=agent_data.get('name', 'Unknown Agent'),
+                version=agent_data.get('version', '1.0.0'),
+                base_url=endpoint,
+                capabilities=agent_data.get('capabilities', []),
+                endpoints=agent_data.get('endpoints', {}),
+                last_seen=seen_at,
+                status="active",
+                response_time_ms=response_time,
+                last_seen_iso=seen_at.isoformat()
+            )
+            
+            logger.info(f"✅ Discovered agent: {agent_info.name} ({agent_info.agent_id}) at {endpoint}")
+            return agent_info
+            
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ Discovery probe timed out after {DISCOVERY_TIMEOUT}s at {endpoint}")
+            return None
+        except PROBE_ERRORS as e:
             logger.warning(f"⚠️ Failed to discover agent at {endpoint}: {e}")
             return None
     
     async def _check_agent_availability(self, base_url: str) -> bool:
         """Check if an agent is currently available"""
         try:
-            async with httpx.AsyncClient(timeout=3.0) as client:
-                response = await client.get(f"{base_url}/")
-                return response.status_code == 200
-        except:
+            response = await asyncio.wait_for(
+                self._client.get(f"{base_url}/", timeout=AVAILABILITY_TIMEOUT),
+                timeout=AVAILABILITY_TIMEOUT
+            )
+            return response.status_code == 200
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ Availability check timed out after {AVAILABILITY_TIMEOUT}s at {base_url}")
+            return False
+        except PROBE_ERRORS as e:
+            logger.debug(f"Availability check failed for {base_url}: {e}")
             return False
     
-    def _update_capability_index(self, agent: AgentInfo):
+    def _update_capability_index(self, agent: AgentInfo, previous: Optional[AgentInfo] = None):
         """Update the capability index with agent information"""
+        # Drop capabilities a re-discovered agent no longer advertises
+        if previous is not None:
+            for capability in previous.capabilities_set - agent.capabilities_set:
+                agent_ids = self.capability_index.get(capability)
+                if agent_ids is not None:
+                    agent_ids.discard(agent.agent_id)
+                    if not agent_ids:
+                        del self.capability_index[capability]
+        
         for capability in agent.capabilities:
-            if capability not in self.capability_index:
-                self.capability_index[capability] = []
-            if agent.agent_id not in self.capability_index[capability]:
-                self.capability_index[capability].append(agent.agent_id)
+            self.capability_index.setdefault(capability, set()).add(agent.agent_id)
     
     def _generate_capability_summary(self) -> Dict[str, List[str]]:
-        """Generate a summary of capabilities and which agents provide them"""
+        """Generate a summary of capabilities and which agents provide them
+        
+        The lists are snapshots for serialization; order within a list is not significant.
+        """
         return {
-            capability: agent_ids.copy() 
+            capability: list(agent_ids)
             for capability, agent_ids in self.capability_index.items()
         }
     
@@ -316,45 +669,35 @@ class AgentDiscoveryService:
         health_score = (total_discovered / total_expected) * 100 if total_expected > 0 else 0
         
         # Check for essential capabilities
-        essential_capabilities = ['flight_search', 'hotel_search', 'activity_search', 'itinerary_generation']
-        covered_essential = sum(1 for cap in essential_capabilities if cap in self.capability_index)
+        covered_essential = sum(1 for cap in ESSENTIAL_CAPABILITIES if cap in self.capability_index)
         
         return {
             "overall_health_score": round(health_score, 1),
             "agents_discovered": f"{total_discovered}/{total_expected}",
-            "essential_capabilities_covered": f"{covered_essential}/{len(essential_capabilities)}",
+            "essential_capabilities_covered": f"{covered_essential}/{len(ESSENTIAL_CAPABILITIES)}",
             "status": "healthy" if health_score >= 80 else "degraded" if health_score >= 60 else "critical",
             "redundancy_level": self._calculate_redundancy_level()
         }
     
-    def _determine_required_capabilities(self, task_type: str, requirements: Dict[str, Any]) -> List[str]:
+    def _determine_required_capabilities(self, task_type: str, requirements: Dict[str, Any]) -> Sequence[str]:
         """Determine what capabilities are needed for a task"""
-        capability_maps = {
-            "comprehensive_trip_planning": [
-                "flight_search", "hotel_search", "activity_search", "itinerary_generation"
-            ],
-            "budget_optimization": [
-                "budget_negotiation", "price_optimization", "cost_analysis"
-            ],
-            "disruption_handling": [
-                "disruption_handling", "alternative_planning", "real_time_updates"
-            ],
-            "itinerary_generation": [
-                "itinerary_generation", "schedule_optimization", "ai_recommendations"
-            ]
-        }
-        
-        return capability_maps.get(task_type, ["general_travel_assistance"])
+        return _CAPABILITY_MAPS.get(task_type, _DEFAULT_CAPABILITIES)
     
     def _select_best_agent(self, available_agents: List[Dict], preferred_agents: List[str]) -> Dict[str, Any]:
         """Select the best agent for a task"""
-        # Prefer specified agents
+        preferred = set(preferred_agents)
+        
+        # First preferred agent wins; otherwise the fastest one seen in the same pass
+        fastest = None
+        fastest_time = None
         for agent in available_agents:
-            if agent['agent_id'] in preferred_agents:
+            if agent['agent_id'] in preferred:
                 return agent
+            response_time = agent.get('response_time_ms', 1000)
+            if fastest is None or response_time < fastest_time:
+                fastest, fastest_time = agent, response_time
         
-        # Otherwise, select by response time
-        return min(available_agents, key=lambda x: x.get('response_time_ms', 1000))
+        return fastest
     
     def _generate_coordination_strategy(self, coordination_plan: Dict[str, Any], 
                                      task_type: str, requirements: Dict[str, Any]) -> Dict[str, Any]:
@@ -370,14 +713,7 @@ class AgentDiscoveryService:
     
     def _estimate_execution_time(self, coordination_plan: Dict[str, Any]) -> str:
         """Estimate how long the coordinated task will take"""
-        base_times = {
-            "flight_search": 3000,  # 3 seconds
-            "hotel_search": 2500,   # 2.5 seconds
-            "activity_search": 2000, # 2 seconds
-            "itinerary_generation": 5000  # 5 seconds
-        }
-        
-        total_time_ms = sum(base_times.get(cap, 1000) for cap in coordination_plan.keys())
+        total_time_ms = sum(_BASE_TIMES_MS.get(cap, 1000) for cap in coordination_plan.keys())
         return f"{total_time_ms / 1000:.1f}s"
     
     def _calculate_success_probability(self, coordination_plan: Dict[str, Any]) -> float:
@@ -395,11 +731,31 @@ class AgentDiscoveryService:
     
     async def _refresh_agent_statuses(self):
         """Refresh the status of all registered agents"""
-        for agent_id, agent_info in self.agent_registry.items():
-            is_available = await self._check_agent_availability(agent_info.base_url)
+        sem = asyncio.Semaphore(STATUS_REFRESH_CONCURRENCY)
+        
+        async def check(agent_info: AgentInfo) -> Tuple[AgentInfo, bool]:
+            async with sem:
+                return agent_info, await self._check_agent_availability(agent_info.base_url)
+        
+        # Snapshot the registry: discovery may replace entries while checks run
+        results = await asyncio.gather(*(check(agent_info) for agent_info in list(self.agent_registry.values())))
+        
+        for agent_info, is_available in results:
             agent_info.status = "active" if is_available else "inactive"
             if is_available:
-                agent_info.last_seen = datetime.now()
+                touch_agent(agent_info)
+            agent_info._cached_dict = None
+    
+    def _collect_stats(self) -> EcosystemStats:
+        """Split the registry by status and gather active capabilities in one pass"""
+        stats = EcosystemStats(active=[], inactive=[], capabilities=set())
+        for agent in self.agent_registry.values():
+            if agent.status == "active":
+                stats.active.append(agent)
+                stats.capabilities.update(agent.capabilities_set)
+            else:
+                stats.inactive.append(agent)
+        return stats
     
     def _get_capability_distribution(self) -> Dict[str, int]:
         """Get distribution of capabilities across agents"""
@@ -408,9 +764,8 @@ class AgentDiscoveryService:
             for capability, agent_ids in self.capability_index.items()
         }
     
-    def _calculate_ecosystem_health_score(self) -> float:
+    def _calculate_ecosystem_health_score(self, active_count: int) -> float:
         """Calculate overall ecosystem health score"""
-        active_count = sum(1 for agent in self.agent_registry.values() if agent.status == "active")
         total_count = len(self.agent_registry)
         
         if total_count == 0:
@@ -434,12 +789,10 @@ class AgentDiscoveryService:
                               self.agent_registry[agent_id].status != "active"]
         }
     
-    def _generate_ecosystem_recommendations(self) -> List[str]:
+    def _generate_ecosystem_recommendations(self, active_count: int) -> List[str]:
         """Generate recommendations for ecosystem improvement"""
         recommendations = []
         
-        active_count = sum(1 for agent in self.agent_registry.values() if agent.status == "active")
-        
         if active_count < 3:
             recommendations.append("Consider starting more agents for better redundancy")
         
@@ -468,16 +821,10 @@ class AgentDiscoveryService:
         else:
             return "low"
     
-    def _determine_execution_order(self, coordination_plan: Dict[str, Any], task_type: str) -> List[str]:
+    def _determine_execution_order(self, coordination_plan: Dict[str, Any], task_type: str) -> Sequence[str]:
         """Determine optimal execution order for capabilities"""
-        order_maps = {
-            "comprehensive_trip_planning": ["flight_search", "hotel_search", "activity_search", "itinerary_generation"],
-            "budget_optimization": ["budget_analysis", "price_optimization", "budget_negotiation"],
-            "disruption_handling": ["disruption_detection", "alternative_planning", "rebooking"]
-        }
-        
-        default_order = list(coordination_plan.keys())
-        return order_maps.get(task_type, default_order)
+        order = _ORDER_MAPS.get(task_type)
+        return order if order is not None else list(coordination_plan.keys())
     
     def _define_success_criteria(self, task_type: str, requirements: Dict[str, Any]) -> Dict[str, Any]:
         """Define success criteria for the task"""
@@ -492,10 +839,22 @@ class AgentDiscoveryService:
 def create_discovery_service_app() -> FastAPI:
     """Create FastAPI app for Agent Discovery Service"""
     
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        refresher = asyncio.create_task(discovery_service.run_refresh_loop())
+        yield
+        refresher.cancel()
+        # Let the refresher unwind before its client is closed under it
+        with suppress(asyncio.CancelledError):
+            await refresher
+        await discovery_service.aclose()
+    
     app = FastAPI(
         title="AgentDiscoveryService",
         description="A2A Protocol service discovery and coordination hub",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
     )
     
     # Add CORS for cross-agent communication
@@ -523,7 +882,8 @@ def create_discovery_service_app() -> FastAPI:
                 "find_capability": "/api/find-agents/{capability}",
                 "coordinate": "/api/coordinate-agents",
                 "ecosystem_status": "/api/ecosystem-status",
-                "test_communication": "/api/test-communication"
+                "test_communication": "/api/test-communication",
+                "batch": "/api/batch"
             }
         }
     
@@ -547,7 +907,8 @@ def create_discovery_service_app() -> FastAPI:
                 "find_agents_by_capability": "/api/find-agents/{capability}",
                 "coordinate_agents": "/api/coordinate-agents",
                 "get_ecosystem_status": "/api/ecosystem-status",
-                "test_agent_communication": "/api/test-communication"
+                "test_agent_communication": "/api/test-communication",
+                "execute_batch": "/api/batch"
             },
             "communication_protocols": ["HTTP", "JSON"],
             "service_type": "discovery_and_coordination",
@@ -555,12 +916,14 @@ def create_discovery_service_app() -> FastAPI:
         }
     
     @app.post("/api/discover-agents")
-    async def discover_agents():
-        """Discover all available A2A agents in the ecosystem"""
-        result = await discovery_service.discover_all_agents()
+    async def discover_agents(force: bool = False, wait_all: bool = True):
+        """Discover all available A2A agents in the ecosystem (force=true bypasses the cache,
+        wait_all=false returns once essential capabilities are covered)"""
+        result = await discovery_service.discover_all_agents(force=force, wait_all=wait_all)
         return {
             "success": True,
-            "discovery_result": result
+            "discovery_result": result,
+            "last_refresh": discovery_service.last_refresh
         }
     
     @app.get("/api/find-agents/{capability}")
@@ -584,12 +947,13 @@ def create_discovery_service_app() -> FastAPI:
         }
     
     @app.get("/api/ecosystem-status")
-    async def get_ecosystem_status():
-        """Get comprehensive status of the A2A ecosystem"""
-        status = await discovery_service.get_ecosystem_status()
+    async def get_ecosystem_status(force: bool = False):
+        """Get comprehensive status of the A2A ecosystem (force=true bypasses the cache)"""
+        status = await discovery_service.get_ecosystem_status(force=force)
         return {
             "success": True,
-            "ecosystem_status": status
+            "ecosystem_status": status,
+            "last_refresh": discovery_service.last_refresh
         }
     
     @app.post("/api/test-communication")
@@ -604,6 +968,27 @@ def create_discovery_service_app() -> FastAPI:
         result = await discovery_service.test_agent_communication(source_agent_id, target_agent_id)
         return result
     
+    @app.post("/api/batch")
+    async def execute_batch(request_data: Dict[str, Any]):
+        """Forward multiple agent calls in one request; results keep request order"""
+        calls = request_data.get('calls')
+        
+        if not isinstance(calls, list) or not calls:
+            raise HTTPException(status_code=400, detail="calls must be a non-empty list")
+        if len(calls) > MAX_BATCH_CALLS:
+            raise HTTPException(status_code=400, detail=f"at most {MAX_BATCH_CALLS} calls per batch")
+        for call in calls:
+            path = call.get('path') if isinstance(call, dict) else None
+            if isinstance(path, str) and path not in BATCHABLE_PATHS:
+                raise HTTPException(status_code=400, detail=f"{path} can't be batched")
+        
+        results = await discovery_service.execute_batch(calls)
+        return {
+            "success": True,
+            "results": results,
+            "total_calls": len(results)
+        }
+    
     return app
 
 
@@ -6,21 +6,216 @@ using the Agent-to-Agent protocol for inter-agent communication.
 """
 
 import asyncio
+import httpx
+import importlib.util
 import logging
+import orjson
 import sys
 import os
-from typing import Dict, List, Optional, Any
+import random
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, List, Optional, Any, Set, Tuple, Union
 from datetime import datetime, date
 from decimal import Decimal
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 import uvicorn
 
 # Simple imports for now - will enhance to full A2A later
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+# travel_apis lives one directory up; make it importable once, at import time
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.append(_SRC_DIR)
+try:
+    from travel_apis import TravelAPIManager, FlightSearchParams
+    _TRAVEL_APIS_IMPORT_ERROR: Optional[ImportError] = None
+except ImportError as e:
+    TravelAPIManager = FlightSearchParams = None
+    _TRAVEL_APIS_IMPORT_ERROR = e
+
+try:
+    import h2  # noqa: F401 - presence enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+    REDIS_ERRORS = (RedisError, OSError)
+except ImportError:
+    aioredis = None
+    REDIS_ERRORS = (OSError,)
 
 logger = logging.getLogger(__name__)
 
+# Optional Redis shared by every worker/replica as a second flight cache
+# level; set REDIS_URL (and install redis) to enable it
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Pool shared by every Amadeus call (token and flight offers), so connections
+# and TLS sessions are reused between searches. Searches keep the 30s read
+# budget they had with per-call clients; connecting should be quick.
+UPSTREAM_TIMEOUT = httpx.Timeout(30.0, connect=3.0)
+UPSTREAM_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+# Amadeus flight offers are cached per normalized search: priced offers for
+# FLIGHT_CACHE_TTL seconds, searches that found nothing for FLIGHT_NEGATIVE_TTL,
+# bounded to FLIGHT_CACHE_SIZE entries (LRU)
+FLIGHT_CACHE_TTL = 600.0
+FLIGHT_NEGATIVE_TTL = 30.0
+FLIGHT_CACHE_SIZE = 1024
+
+# Search results with more than FLIGHT_STREAM_THRESHOLD offers are streamed
+# as chunked JSON, FLIGHT_STREAM_CHUNK offers per chunk, instead of being
+# encoded into one buffer first
+FLIGHT_STREAM_THRESHOLD = 100
+FLIGHT_STREAM_CHUNK = 50
+
+# A search makes up to len(HEDGE_DELAYS) Amadeus attempts; each one starts
+# when the previous attempt has failed or come back empty. With
+# FLIGHT_AGENT_HEDGE=1, attempt n also starts HEDGE_DELAYS[n] seconds after the
+# first if nothing has answered yet, and the first non-empty result wins.
+# Hedged attempts spend Amadeus quota on searches that may still succeed, so
+# hedging is off by default.
+HEDGE_DELAYS = (0.0, 1.5, 4.0)
+HEDGE_SEARCHES = os.getenv("FLIGHT_AGENT_HEDGE") == "1"
+
+# Full-jitter exponential backoff before the next attempt once every running
+# one has failed: uniform(0, RETRY_BASE_DELAY * 2**n) seconds
+RETRY_BASE_DELAY = 0.2
+
+# Browser origins allowed to call the agent: the frontend (served on 8000)
+# and the other A2A agents; FLIGHT_AGENT_CORS_ORIGINS (comma-separated)
+# replaces the list. Preflights are cached for CORS_MAX_AGE seconds.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "FLIGHT_AGENT_CORS_ORIGINS",
+        ",".join(f"http://{host}:{port}" for host in ("localhost", "127.0.0.1") for port in range(8000, 8006))
+    ).split(",")
+    if origin.strip()
+]
+CORS_METHODS = ["GET", "POST"]
+CORS_HEADERS = ["content-type", "authorization", "x-a2a-token"]
+CORS_MAX_AGE = 86400
+
+# Search dates are YYYY-MM-DD strings. date.fromisoformat alone also accepts
+# other ISO 8601 forms (e.g. 20251115) on Python 3.11+.
+SEARCH_DATE_FORMAT = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+# Serve on uvloop/httptools when installed (both ship with uvicorn[standard]);
+# FLIGHT_AGENT_WORKERS > 1 runs that many worker processes.
+UVICORN_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+UVICORN_HTTP = "httptools" if importlib.util.find_spec("httptools") else "auto"
+
+
+class NegotiationState(IntEnum):
+    """Where a price negotiation stands after an offer"""
+    START = 0
+    ACCEPTED = 1
+    COUNTERED = 2
+
+
+class NegotiationEvent(IntEnum):
+    """How an offer compares to the current price and the discount floor"""
+    OFFER_AT_PRICE = 0     # requested >= current price
+    OFFER_IN_RANGE = 1     # discount floor <= requested < current price
+    OFFER_BELOW_FLOOR = 2  # requested < discount floor
+
+
+# Offer/accept/counter transitions; a countered negotiation can take a new
+# offer in a later round
+_OFFER_TRANSITIONS = {
+    NegotiationEvent.OFFER_AT_PRICE: NegotiationState.ACCEPTED,
+    NegotiationEvent.OFFER_IN_RANGE: NegotiationState.ACCEPTED,
+    NegotiationEvent.OFFER_BELOW_FLOOR: NegotiationState.COUNTERED
+}
+NEGOTIATION_TRANSITIONS = {
+    NegotiationState.START: _OFFER_TRANSITIONS,
+    NegotiationState.COUNTERED: _OFFER_TRANSITIONS
+}
+
+NEGOTIATION_MESSAGES = {
+    NegotiationEvent.OFFER_AT_PRICE: "Standard price accepted",
+    NegotiationEvent.OFFER_IN_RANGE: "Negotiated price accepted: ${requested_price}",
+    NegotiationEvent.OFFER_BELOW_FLOOR: "Counter-offer: ${final_price}"
+}
+
+
+@dataclass(frozen=True, slots=True)
+class NegotiatedFlight:
+    """A flight offer as returned to other agents, with negotiation terms
+    
+    Frozen so cached offers can be shared between requests without copying.
+    """
+    flight_id: str
+    airline: str
+    departure_airport: str
+    arrival_airport: str
+    departure_time: Union[str, datetime]  # ISO string from Amadeus; datetime from mock data
+    arrival_time: Union[str, datetime]
+    price: float
+    booking_class: str
+    available_seats: int
+    agent_id: str
+    negotiable: bool
+    min_price: float
+    negotiation_expires: str
+    real_api_data: bool = True
+    api_source: str = "Amadeus"
+
+
+async def stream_flight_results(agent_id: str, flights: List[NegotiatedFlight]):
+    """Encode a search response as JSON fragments, a chunk of offers at a time
+    
+    Produces the same document as the non-streamed response, so only the
+    current chunk's bytes are held in memory.
+    """
+    yield b'{"success":true,"agent_id":' + orjson.dumps(agent_id) + b',"flights":['
+    for start in range(0, len(flights), FLIGHT_STREAM_CHUNK):
+        chunk = b",".join(orjson.dumps(flight) for flight in flights[start:start + FLIGHT_STREAM_CHUNK])
+        yield chunk if start == 0 else b"," + chunk
+    yield b'],"total_found":' + str(len(flights)).encode() + b',"negotiation_available":true}'
+
+
+class FlightOffer(BaseModel):
+    """Response schema for a NegotiatedFlight"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    flight_id: str
+    airline: str
+    departure_airport: str
+    arrival_airport: str
+    departure_time: Union[str, datetime]
+    arrival_time: Union[str, datetime]
+    price: float
+    booking_class: str
+    available_seats: int
+    agent_id: str
+    negotiable: bool
+    min_price: float
+    negotiation_expires: str
+    real_api_data: bool = True
+    api_source: str = "Amadeus"
+
+
+class FlightSearchResponse(BaseModel):
+    """Response schema for /api/search-flights"""
+    success: bool
+    agent_id: str
+    flights: List[FlightOffer]
+    total_found: int
+    negotiation_available: bool
+
 
 class FlightBookingAgent:
     """
@@ -39,21 +234,46 @@ class FlightBookingAgent:
             "availability_checking"
         ]
         
+        self._http = httpx.AsyncClient(timeout=UPSTREAM_TIMEOUT, limits=UPSTREAM_LIMITS, http2=HTTP2_AVAILABLE)
+        
         # Initialize real API connections
-        try:
-            import sys
-            import os
-            sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from travel_apis import TravelAPIManager
-            self.travel_apis = TravelAPIManager()
+        if TravelAPIManager is not None:
+            self.travel_apis = TravelAPIManager(client=self._http)
             print("✅ Connected to real flight APIs (Amadeus)")
-        except ImportError as e:
-            print(f"⚠️  Could not import TravelAPIManager - using mock data: {e}")
+        else:
+            print(f"⚠️  Could not import TravelAPIManager - using mock data: {_TRAVEL_APIS_IMPORT_ERROR}")
             self.travel_apis = None
         
+        # Normalized search key -> (expires_ns on the monotonic clock, flights)
+        self._flight_cache: "OrderedDict[Tuple, Tuple[int, List[NegotiatedFlight]]]" = OrderedDict()
+        self._redis = aioredis.from_url(REDIS_URL) if REDIS_URL and aioredis is not None else None
+        if REDIS_URL and self._redis is None:
+            print("⚠️  REDIS_URL is set but redis is not installed - using the in-process flight cache only")
+        
+        # Amadeus search currently running for a key, shared by identical requests
+        self._inflight_searches: Dict[Tuple, "asyncio.Task"] = {}
+        
         logger.info(f"✈️ FlightBookingAgent initialized with capabilities: {self.capabilities}")
     
-    async def search_flights(self, request_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def warm_up(self):
+        """Fetch the Amadeus OAuth token up front so no search pays for it"""
+        if self.travel_apis is None or not self.travel_apis.flight_api.use_amadeus:
+            return
+        try:
+            await self.travel_apis.flight_api.get_access_token()
+        except Exception as e:
+            # Rejected credentials: start anyway; searches report the error
+            logger.error(f"❌ Could not fetch the Amadeus access token: {e}")
+            return
+        logger.info("🔑 Amadeus access token ready")
+    
+    async def aclose(self):
+        """Close the shared upstream HTTP client and the Redis connection pool"""
+        await self._http.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+    
+    async def search_flights(self, request_data: Dict[str, Any]) -> List[NegotiatedFlight]:
         """Search for flights using ONLY real APIs - no mock data fallbacks"""
         departure = request_data.get('departure_location', 'NYC')
         destination = request_data.get('destination', 'LAX')
@@ -68,118 +288,289 @@ class FlightBookingAgent:
             logger.error("❌ No real travel APIs available - cannot provide flight data")
             raise Exception("Real flight APIs not available - refusing to return mock data")
         
-        # Retry logic for API calls
-        max_retries = 3
-        retry_delay = 2  # seconds
+        # Malformed dates fail here with ValueError, before any upstream call
+        if not isinstance(start_date, str) or not SEARCH_DATE_FORMAT.fullmatch(start_date):
+            raise ValueError(f"start_date must be a YYYY-MM-DD date, got {start_date!r}")
+        search_date = date.fromisoformat(start_date)
         
-        for attempt in range(max_retries):
-            try:
-                # Use real API for flight search
-                search_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-                
-                # Convert budget to per-person flight budget (assume 40% of total budget for flights)
-                flight_budget = float(budget) * 0.4 / travelers if budget else None
+        # Convert budget to per-person flight budget (assume 40% of total budget for flights)
+        flight_budget = float(budget) * 0.4 / travelers if budget else None
+        
+        cache_key = (
+            departure.strip().upper(), destination.strip().upper(), start_date,
+            int(travelers), round(flight_budget or 0.0, 2)
+        )
+        flights = self._cached_flights(cache_key)
+        if flights is not None:
+            logger.info(f"⚡ Serving cached flights for {departure} → {destination}")
+        else:
+            # Join an identical search already talking to Amadeus instead of starting another
+            search = self._inflight_searches.get(cache_key)
+            if search is None:
+                search = asyncio.ensure_future(self._fetch_search(
+                    cache_key, departure, destination, start_date, search_date, travelers, flight_budget
+                ))
+                self._inflight_searches[cache_key] = search
+                search.add_done_callback(lambda _: self._inflight_searches.pop(cache_key, None))
+            
+            # shield: one caller giving up must not cancel the search for the others
+            flights = await asyncio.shield(search)
+        
+        return flights
+    
+    async def _fetch_search(self, cache_key: Tuple, departure: str, destination: str, start_date: str,
+                           search_date: date, travelers: int,
+                           flight_budget: Optional[float]) -> List[NegotiatedFlight]:
+        """Resolve a flight search from the shared Redis cache, else from Amadeus"""
+        flights = await self._redis_get_flights(cache_key)
+        if flights is not None:
+            return flights
+        
+        flights = await self._search_amadeus(
+            cache_key, departure, destination, start_date, search_date, travelers, flight_budget
+        )
+        await self._redis_store_flights(cache_key, flights)
+        return flights
+    
+    async def _search_amadeus(self, cache_key: Tuple, departure: str, destination: str, start_date: str,
+                              search_date: date, travelers: int,
+                              flight_budget: Optional[float]) -> List[NegotiatedFlight]:
+        """Run the Amadeus search and cache the outcome"""
+        params = FlightSearchParams(
+            origin=departure,
+            destination=destination,
+            departure_date=search_date,
+            passengers=travelers,
+            max_price=Decimal(str(flight_budget)) if flight_budget else None
+        )
+        real_flights = await self._hedged_search(params)
+        
+        if not real_flights:
+            logger.error("❌ No flights found after all attempts")
+            self._store_flights(cache_key, [], FLIGHT_NEGATIVE_TTL)
+            return []
+        
+        # Convert to A2A format with negotiation capabilities
+        # Values shared by every offer in this search
+        fallback_id = datetime.now().timestamp()
+        departure_default = f"{start_date}T08:00:00"
+        arrival_default = f"{start_date}T12:00:00"
+        negotiation_expires = f"{start_date}T20:00:00"
+        
+        flights_with_negotiation = []
+        for flight in real_flights:
+            price = float(flight.get('price', 0) or 0)
+            flights_with_negotiation.append(NegotiatedFlight(
+                flight_id=f"REAL_{flight.get('id', fallback_id)}",
+                airline=flight.get('airline', 'Unknown Airline'),
+                departure_airport=flight.get('departure_airport', departure),
+                arrival_airport=flight.get('arrival_airport', destination),
+                departure_time=flight.get('departure_time', departure_default),
+                arrival_time=flight.get('arrival_time', arrival_default),
+                price=price,
+                booking_class=flight.get('booking_class', 'Economy'),
+                available_seats=flight.get('available_seats', 0),
+                agent_id=self.agent_id,
+                negotiable=True,
+                min_price=price * 0.9 if price > 0 else 0.0,
+                negotiation_expires=negotiation_expires
+            ))
+        
+        logger.info(f"✅ Found {len(flights_with_negotiation)} REAL flights from Amadeus API")
+        self._store_flights(cache_key, flights_with_negotiation, FLIGHT_CACHE_TTL)
+        return flights_with_negotiation
+    
+    async def _hedged_search(self, params: "FlightSearchParams") -> List[Dict[str, Any]]:
+        """Run Amadeus attempts and return the first non-empty result
+        
+        When every running attempt has failed (retryably) or come back empty,
+        the next one starts after the usual backoff. With HEDGE_SEARCHES,
+        attempt n also starts HEDGE_DELAYS[n] seconds in if it isn't needed
+        sooner. A non-retryable error fails the search at once; the losing
+        attempts are cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        # When the next attempt starts; None while it waits for the running ones
+        next_start: Optional[float] = loop.time()
+        attempts: Set[asyncio.Task] = set()
+        launched = 0
+        last_error: Optional[Exception] = None
+        
+        try:
+            while True:
+                if launched < len(HEDGE_DELAYS) and next_start is not None and loop.time() >= next_start:
+                    logger.info(f"🌐 Attempt {launched + 1}/{len(HEDGE_DELAYS)}: Calling Amadeus API...")
+                    attempts.add(asyncio.ensure_future(self.travel_apis.flight_api.search_flights(params)))
+                    launched += 1
+                    if launched < len(HEDGE_DELAYS) and HEDGE_SEARCHES:
+                        # Spaced from this launch, which may have come early or late
+                        next_start = loop.time() + HEDGE_DELAYS[launched] - HEDGE_DELAYS[launched - 1]
+                    else:
+                        next_start = None
                 
-                # Import required classes
-                sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                from travel_apis import FlightSearchParams
+                more_to_launch = launched < len(HEDGE_DELAYS)
+                next_scheduled = more_to_launch and next_start is not None
+                if not attempts:
+                    if not more_to_launch:
+                        break
+                    await asyncio.sleep(max(0.0, next_start - loop.time()))
+                    continue
                 
-                params = FlightSearchParams(
-                    origin=departure,
-                    destination=destination,
-                    departure_date=search_date,
-                    passengers=travelers,
-                    max_price=Decimal(str(flight_budget)) if flight_budget else None
+                done, attempts = await asyncio.wait(
+                    attempts,
+                    timeout=max(0.0, next_start - loop.time()) if next_scheduled else None,
+                    return_when=asyncio.FIRST_COMPLETED
                 )
-                
-                logger.info(f"🌐 Attempt {attempt + 1}/{max_retries}: Calling Amadeus API with 10s timeout...")
-                
-                # TravelAPIManager delegates to FlightBookingAPI - NO TIMEOUTS
-                real_flights = await self.travel_apis.flight_api.search_flights(params)
-                
-                if not real_flights:
-                    logger.warning(f"⚠️ No flights from Amadeus on attempt {attempt + 1}")
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(retry_delay)
-                        continue
+                for task in done:
+                    try:
+                        real_flights = task.result()
+                    except Exception as e:
+                        logger.error(f"❌ Amadeus attempt failed: {e}")
+                        if not self._is_retryable(e):
+                            logger.error("❌ Non-retryable flight search error - giving up")
+                            raise
+                        delay = self._backoff_delay(launched - 1)
+                        last_error = e
                     else:
-                        logger.error("❌ No flights found after all retries")
-                        return []
-                
-                # Convert to A2A format with negotiation capabilities
-                flights_with_negotiation = []
-                for flight in real_flights:
-                    flight_dict = {
-                        "flight_id": f"REAL_{flight.get('id', datetime.now().timestamp())}",
-                        "airline": flight.get('airline', 'Unknown Airline'),
-                        "departure_airport": flight.get('departure_airport', departure),
-                        "arrival_airport": flight.get('arrival_airport', destination),
-                        "departure_time": flight.get('departure_time', f"{start_date}T08:00:00"),
-                        "arrival_time": flight.get('arrival_time', f"{start_date}T12:00:00"),
-                        "price": float(flight.get('price', 0)),
-                        "booking_class": flight.get('booking_class', 'Economy'),
-                        "available_seats": flight.get('available_seats', 0),
-                        "agent_id": self.agent_id,
-                        "negotiable": True,
-                        "min_price": float(flight.get('price', 0)) * 0.9 if flight.get('price', 0) > 0 else 0,
-                        "negotiation_expires": f"{start_date}T20:00:00",
-                        "real_api_data": True,
-                        "api_source": "Amadeus"
-                    }
-                    flights_with_negotiation.append(flight_dict)
-                
-                logger.info(f"✅ Found {len(flights_with_negotiation)} REAL flights from Amadeus API")
-                return flights_with_negotiation
-                
-            except Exception as e:
-                logger.error(f"❌ API call failed on attempt {attempt + 1}: {e}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
-                else:
-                    logger.error("❌ All API retry attempts failed")
-                    raise Exception(f"Failed to get real flight data after {max_retries} attempts: {e}")
+                        if real_flights:
+                            return real_flights
+                        # An attempt got an answer: an earlier failure no longer
+                        # makes the search an error, just an empty one
+                        last_error = None
+                        logger.warning("⚠️ No flights from Amadeus on this attempt")
+                        delay = self._backoff_delay(launched - 1)
+                    
+                    # Nothing left in flight: don't wait out the hedge schedule
+                    if not attempts and more_to_launch:
+                        next_start = loop.time() + delay
+        finally:
+            for task in attempts:
+                task.cancel()
+            if attempts:
+                await asyncio.gather(*attempts, return_exceptions=True)
+        
+        if last_error is not None:
+            logger.error("❌ All API attempts failed")
+            raise Exception(f"Failed to get real flight data after {launched} attempts: {last_error}")
+        return []
+    
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Full-jitter exponential backoff for the given attempt"""
+        return random.uniform(0, RETRY_BASE_DELAY * (2 ** attempt))
+    
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Whether another attempt could get a different answer after error
+        
+        FlightBookingAPI answers HTTP and transport failures with mock results.
+        Missing or rejected credentials (marked retryable = False) fail the
+        same way on every attempt; other errors are retried.
+        """
+        return getattr(error, "retryable", True)
+    
+    @staticmethod
+    def _redis_key(key: Tuple) -> str:
+        """Redis key for a flight search: fsearch:<origin>:<destination>:<date>:<travelers>:<budget>"""
+        return "fsearch:" + ":".join(str(part) for part in key)
+    
+    async def _redis_get_flights(self, key: Tuple) -> Optional[List[NegotiatedFlight]]:
+        """Look a flight search up in Redis, copying a hit into the in-process cache"""
+        if self._redis is None:
+            return None
+        
+        redis_key = self._redis_key(key)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                raw, ttl_ms = await pipe.get(redis_key).pttl(redis_key).execute()
+        except REDIS_ERRORS as e:
+            logger.warning(f"⚠️ Redis flight cache read failed: {e}")
+            return None
+        
+        if raw is None or ttl_ms <= 0:
+            return None
+        
+        try:
+            flights = [NegotiatedFlight(**flight) for flight in orjson.loads(raw)]
+        except (orjson.JSONDecodeError, TypeError) as e:
+            # Corrupt, or written by an older NegotiatedFlight: drop it and search again
+            logger.warning(f"⚠️ Discarding unreadable Redis flight cache entry {redis_key}: {e}")
+            try:
+                await self._redis.delete(redis_key)
+            except REDIS_ERRORS as delete_error:
+                logger.warning(f"⚠️ Redis flight cache delete failed: {delete_error}")
+            return None
+        
+        self._store_flights(key, flights, ttl_ms / 1000)
+        return flights
+    
+    async def _redis_store_flights(self, key: Tuple, flights: List[NegotiatedFlight]):
+        """Write a flight search through to Redis with the same TTL as the in-process cache"""
+        if self._redis is None:
+            return
+        
+        ttl = FLIGHT_CACHE_TTL if flights else FLIGHT_NEGATIVE_TTL
+        try:
+            await self._redis.set(self._redis_key(key), orjson.dumps(flights), px=int(ttl * 1000))
+        except REDIS_ERRORS as e:
+            logger.warning(f"⚠️ Redis flight cache write failed: {e}")
+    
+    def _cached_flights(self, key: Tuple) -> Optional[List[NegotiatedFlight]]:
+        """Return the cached flights for a search, if still fresh"""
+        cached = self._flight_cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic_ns():
+            del self._flight_cache[key]
+            return None
+        self._flight_cache.move_to_end(key)
+        return cached[1]
+    
+    def _store_flights(self, key: Tuple, flights: List[NegotiatedFlight], ttl: float):
+        """Cache a search result for ttl seconds, evicting the least recently used"""
+        self._flight_cache[key] = (time.monotonic_ns() + int(ttl * 1_000_000_000), flights)
+        self._flight_cache.move_to_end(key)
+        while len(self._flight_cache) > FLIGHT_CACHE_SIZE:
+            self._flight_cache.popitem(last=False)
     
     async def negotiate_price(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Negotiate flight price with other agents"""
         flight_id = request_data.get('flight_id')
         requested_price = request_data.get('requested_price', 0)
         current_price = request_data.get('current_price', 350)
+        state_name = str(request_data.get('negotiation_state', 'start')).upper()
+        
+        if state_name not in NegotiationState.__members__:
+            raise ValueError(f"Unknown negotiation_state: {state_name.lower()}")
+        transitions = NEGOTIATION_TRANSITIONS.get(NegotiationState[state_name])
+        if transitions is None:
+            raise ValueError(f"Negotiation already {state_name.lower()}")
         
         logger.info(f"💰 Price negotiation for flight {flight_id}: ${requested_price} (was ${current_price})")
         
-        # Intelligent negotiation logic
+        # Intelligent negotiation logic: the price settles at the request,
+        # clamped between the 10% discount floor and the current price
         min_acceptable = current_price * 0.9  # 10% discount max
+        final_price = max(min_acceptable, min(current_price, requested_price))
+        # The floor never exceeds the current price, so the two comparisons
+        # count how far below it the offer is: 0, 1 or 2
+        event = NegotiationEvent(int(requested_price < current_price) + int(requested_price < min_acceptable))
+        state = transitions[event]
+        accepted = state is NegotiationState.ACCEPTED
         
-        if requested_price >= current_price:
-            # Accept if at or above current price
-            result = {
-                "flight_id": flight_id,
-                "negotiation_accepted": True,
-                "final_price": current_price,
-                "agent_id": self.agent_id,
-                "message": "Standard price accepted"
-            }
-        elif requested_price >= min_acceptable:
-            # Accept discounted price
-            result = {
-                "flight_id": flight_id,
-                "negotiation_accepted": True,
-                "final_price": requested_price,
-                "agent_id": self.agent_id,
-                "message": f"Negotiated price accepted: ${requested_price}"
-            }
-        else:
-            # Counter-offer
-            counter_price = min_acceptable
-            result = {
-                "flight_id": flight_id,
-                "negotiation_accepted": False,
-                "counter_offer": counter_price,
-                "final_price": counter_price,
-                "agent_id": self.agent_id,
-                "message": f"Counter-offer: ${counter_price}",
-                "expires_in_minutes": 15
-            }
+        result = {
+            "flight_id": flight_id,
+            "negotiation_accepted": accepted,
+            "negotiation_state": state.name.lower(),
+            "final_price": final_price,
+            "agent_id": self.agent_id,
+            "message": NEGOTIATION_MESSAGES[event].format(
+                requested_price=requested_price, final_price=final_price
+            )
+        }
+        if not accepted:
+            result["counter_offer"] = final_price
+            result["expires_in_minutes"] = 15
         
         logger.info(f"📊 Negotiation result: {result['message']}")
         return result
@@ -196,36 +587,35 @@ class FlightBookingAgent:
             "last_updated": datetime.now().isoformat(),
             "agent_id": self.agent_id
         }
-        """Check real-time flight availability and pricing"""
-        logger.info(f"🔍 Checking availability for flight {flight_id}")
-        
-        return {
-            "flight_id": flight_id,
-            "available": True,
-            "seats_remaining": 12,
-            "price_changed": False,
-            "last_updated": datetime.now().isoformat(),
-            "agent_id": self.agent_id,
-            "booking_deadline": "2025-09-27T18:00:00"
-        }
 
 
 def create_flight_agent_app() -> FastAPI:
     """Create standalone FastAPI app for FlightBookingAgent"""
     
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Token fetched before uvicorn accepts connections, so concurrent
+        # first requests don't each start an OAuth round-trip
+        await agent.warm_up()
+        yield
+        await agent.aclose()
+    
     app = FastAPI(
         title="FlightBookingAgent",
         description="Specialized agent for flight search, booking, and price negotiation",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
     )
     
     # Add CORS for cross-agent communication
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],
+        allow_origins=CORS_ORIGINS,
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=CORS_METHODS,
+        allow_headers=CORS_HEADERS,
+        max_age=CORS_MAX_AGE,
     )
     
     # Initialize agent
@@ -266,22 +656,34 @@ def create_flight_agent_app() -> FastAPI:
             "real_time_updates": True
         }
     
-    @app.post("/api/search-flights")
+    # The model documents the response; the handler returns a response object,
+    # so FastAPI doesn't validate or re-encode the flights against it
+    @app.post("/api/search-flights", response_model=FlightSearchResponse)
     async def search_flights(request_data: Dict[str, Any]):
         """Search for flights with negotiation metadata"""
-        flights = await agent.search_flights(request_data)
-        return {
+        try:
+            flights = await agent.search_flights(request_data)
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid flight search request: {e}") from e
+        if len(flights) > FLIGHT_STREAM_THRESHOLD:
+            return StreamingResponse(stream_flight_results(agent.agent_id, flights), media_type="application/json")
+        # Returned as a response so orjson encodes the flight dataclasses
+        # directly, without a jsonable_encoder pass
+        return ORJSONResponse({
             "success": True,
             "agent_id": agent.agent_id,
             "flights": flights,
             "total_found": len(flights),
             "negotiation_available": True
-        }
+        })
     
     @app.post("/api/negotiate-price")
     async def negotiate_price(request_data: Dict[str, Any]):
         """Negotiate flight prices with other agents"""
-        result = await agent.negotiate_price(request_data)
+        try:
+            result = await agent.negotiate_price(request_data)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid negotiation request: {e}")
         return {
             "success": True,
             "negotiation_result": result
@@ -300,47 +702,7 @@ def create_flight_agent_app() -> FastAPI:
 
 
 if __name__ == "__main__":
-    app = create_flight_agent_app()
-    
-    print("✈️ FlightBookingAgent starting...")
-    print("🔍 Specialized in flight search and booking")
-    print("💰 Supports price negotiation with other agents") 
-    print("📍 Available at: http://localhost:8001")
-    print("🤖 Agent info: http://localhost:8001/.well-known/agent")
-    print("🔗 API endpoints: http://localhost:8001/api/")
-    
-    uvicorn.run(app, host="0.0.0.0", port=8001)
-
-import asyncio
-import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, date
-from decimal import Decimal
-from pydantic import BaseModel
-import uvicorn
-
-# Copy the exact imports from travel_master.py
-from a2a.server.apps.jsonrpc.fastapi_app import A2AFastAPI, JSONRPCApplication
-from a2a.server.context import ServerCallContext
-from a2a.server.request_handlers.jsonrpc_handler import RequestHandler
-from a2a.types import A2ARequest, AgentCard
-
-logger = logging.getLogger(__name__)
-
-
-class FlightSearchRequest(BaseModel):
-    """Request for flight search"""
-    departure_location: str
-    destination: str
-    departure_date: str  # Use string for JSON serialization
-    return_date: Optional[str] = None
-    passengers: int = 1
-    max_budget: float
-    preferences: List[str] = []
-    
-    
-if __name__ == "__main__":
-    app = create_flight_agent_app()
+    workers = int(os.getenv("FLIGHT_AGENT_WORKERS", "1"))
     
     print("✈️ FlightBookingAgent starting...")
     print("🔍 Specialized in flight search and booking")
@@ -349,4 +711,10 @@ if __name__ == "__main__":
     print("🤖 Agent info: http://localhost:8001/.well-known/agent")
     print("🔗 API endpoints: http://localhost:8001/api/")
     
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    server_options = {"host": "0.0.0.0", "port": 8001, "loop": UVICORN_LOOP, "http": UVICORN_HTTP}
+    if workers > 1:
+        # Each worker process builds its own app from the factory
+        uvicorn.run("flight_booking_agent:create_flight_agent_app", factory=True,
+                    workers=workers, **server_options)
+    else:
+        uvicorn.run(create_flight_agent_app(), **server_options)
@@ -6,25 +6,62 @@ and disruption handling while coordinating with other agents in the A2A ecosyste
 """
 
 import asyncio
-import json
+import hashlib
+import itertools
 import logging
-from typing import Dict, List, Any, Optional
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, date, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import os
 import httpx
+import orjson
 import uvicorn
 from dotenv import load_dotenv
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
+try:
+    import h2  # noqa: F401 - presence enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# One pool per process for every Gemini call, so TLS sessions are reused
+# across requests and concurrent itinerary/optimization calls don't queue
+# behind a small pool. The app's lifespan owns it and hands it to the agent.
+GEMINI_TIMEOUT = httpx.Timeout(60.0)
+GEMINI_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+
+
+def create_gemini_http_client() -> httpx.AsyncClient:
+    """Create the pooled client used for Gemini calls"""
+    return httpx.AsyncClient(timeout=GEMINI_TIMEOUT, limits=GEMINI_LIMITS, http2=HTTP2_AVAILABLE)
+
+# Output token budget per task: Gemini latency grows with tokens generated
+GEMINI_MAX_OUTPUT_TOKENS = {
+    "generate-itinerary": 4096,
+    "optimize": 512,
+    "disruption": 256
+}
+GEMINI_DEFAULT_MAX_OUTPUT_TOKENS = 2048
 
-@dataclass
+# Gemini itineraries are cached per canonical request for ITINERARY_CACHE_TTL
+# seconds, bounded to ITINERARY_CACHE_SIZE entries (LRU)
+ITINERARY_CACHE_TTL = 3600
+ITINERARY_CACHE_SIZE = 256
+
+
+@dataclass(slots=True)
 class TripEvent:
     """Represents a single event in the trip itinerary"""
     date: str
@@ -40,7 +77,7 @@ class TripEvent:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DailyItinerary:
     """Represents a full day's schedule"""
     date: str
@@ -51,10 +88,102 @@ class DailyItinerary:
     weather_note: Optional[str] = None
 
 
+# Disruption lookup tables, shared by every request (tuples so they can't be
+# changed through a response)
+_COORDINATION_MAP = {
+    'flight_delay': ('hotel-booking-agent', 'activity-planning-agent'),
+    'weather': ('activity-planning-agent',),
+    'venue_closure': ('activity-planning-agent',),
+    'budget_change': ('flight-booking-agent', 'hotel-booking-agent', 'activity-planning-agent'),
+    'general': ('all-agents',)
+}
+_DEFAULT_COORDINATION = ('activity-planning-agent',)
+
+_IMPACT_LEVELS = {
+    'low': {'cost': '$0-25', 'time': '0-30 min', 'experience': 'Minimal'},
+    'medium': {'cost': '$25-75', 'time': '30-120 min', 'experience': 'Moderate'},
+    'high': {'cost': '$75-200+', 'time': '2-6 hours', 'experience': 'Significant'}
+}
+
+_SEASONAL_RECOMMENDATIONS = (
+    "Fall season: Perfect weather for outdoor activities",
+    "Hurricane season precaution: Monitor weather 48h before outdoor plans",
+    "Festival season: Book popular venues 2 weeks in advance"
+)
+
+# Characters that can change brace depth or string state while scanning JSON
+_JSON_SIGNIFICANT = re.compile(r'[{}"\\]')
+
+
+class JSONObjectScanner:
+    """Finds complete top-level JSON objects in text that may arrive in pieces
+    
+    Tracks brace depth outside string literals, so prose around the object
+    and braces inside its strings don't cut it short or run it on.
+    """
+    
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+    
+    def feed(self, text: str) -> List[str]:
+        """Add text and return the top-level objects it completed, in order"""
+        self._buffer += text
+        buf = self._buffer
+        found = []
+        pos = self._pos
+        match = _JSON_SIGNIFICANT.search(buf, pos)
+        while match:
+            i = match.start()
+            ch = buf[i]
+            pos = i + 1
+            if self._depth == 0:
+                if ch == "{":
+                    self._start = i
+                    self._depth = 1
+            elif self._in_string:
+                if ch == "\\":
+                    pos = i + 2  # skip the escaped character
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    found.append(buf[self._start:i + 1])
+            match = _JSON_SIGNIFICANT.search(buf, pos)
+        
+        if self._depth == 0:
+            # Nothing open: text scanned so far can't be part of a later object
+            self._buffer = ""
+            self._pos = 0
+        else:
+            self._pos = max(pos, len(buf))
+        return found
+
+
+def decode_itinerary_json(candidates: List[str]) -> Optional[Dict[str, Any]]:
+    """Decode the first candidate object that holds itinerary days, if any"""
+    for candidate in candidates:
+        try:
+            data = orjson.loads(candidate)
+        except orjson.JSONDecodeError:
+            continue
+        if isinstance(data, dict) and "days" in data:
+            return data
+    return None
+
+
 class GeminiAIAgent:
     """A2A-compliant AI agent for comprehensive trip planning and management"""
     
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.agent_id = "gemini-ai-agent"
         self.name = "GeminiAIAgent"
         self.version = "2.0.0"
@@ -71,6 +200,20 @@ class GeminiAIAgent:
         # Initialize Gemini API
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.base_url = "https://generativelanguage.googleapis.com/v1beta"
+        # Shared client passed in (or set later), else one the agent creates
+        # on first use and closes in aclose()
+        self._client = client
+        self._owns_client = False
+        
+        # Disruption type -> handler; other types use _handle_general_disruption
+        self._disruption_handlers = {
+            'flight_delay': self._handle_flight_delay,
+            'weather': self._handle_weather_disruption,
+            'venue_closure': self._handle_venue_closure
+        }
+        
+        # Request hash -> (expires_ns on the monotonic clock, itinerary result)
+        self._itinerary_cache: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
         
         if not self.api_key:
             print("⚠️  Google Gemini API key not found. Using enhanced mock intelligence")
@@ -80,6 +223,25 @@ class GeminiAIAgent:
         
         logger.info(f"🧠 GeminiAIAgent initialized with capabilities: {self.capabilities}")
     
+    async def aclose(self):
+        """Close the HTTP client if the agent created it; shared clients are left open"""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._owns_client = False
+    
+    def set_http_client(self, client: httpx.AsyncClient):
+        """Use a client shared with other agents in this process"""
+        self._client = client
+        self._owns_client = False
+    
+    def _http(self) -> httpx.AsyncClient:
+        """Return the client for Gemini calls, creating an owned one if none was given"""
+        if self._client is None:
+            self._client = create_gemini_http_client()
+            self._owns_client = True
+        return self._client
+    
     async def generate_comprehensive_itinerary(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate AI-powered comprehensive itinerary using data from other agents
@@ -100,6 +262,14 @@ class GeminiAIAgent:
             return await self._generate_enhanced_mock_itinerary(trip_data, coordination_data)
         
         try:
+            # Inside the try: request bodies orjson can't encode (e.g. integers
+            # over 64 bits) fall back to the mock itinerary like other failures
+            cache_key = self._itinerary_cache_key(trip_data, special_instructions, coordination_data)
+            cached = self._cached_itinerary(cache_key)
+            if cached is not None:
+                logger.info("⚡ Serving cached AI itinerary")
+                return {**cached, "last_updated": datetime.now().isoformat()}
+            
             # Create AI prompt incorporating A2A agent data
             prompt = await self._create_a2a_itinerary_prompt(trip_data, special_instructions, coordination_data)
             
@@ -107,22 +277,41 @@ class GeminiAIAgent:
             response = await self._call_gemini_api(prompt, "generate-itinerary")
             
             # Parse and structure the response
-            itinerary = await self._parse_itinerary_response(response, trip_data)
+            parsed = await self._parse_itinerary_response(response, trip_data)
+            if parsed is None:
+                logger.warning("⚠️ No itinerary in Gemini response - using placeholder day")
+                itinerary, total_budget = self._placeholder_itinerary()
+            else:
+                itinerary, total_budget = parsed
+            
+            # The enrichment steps are independent; a failed one falls back to an
+            # empty section instead of failing the itinerary
+            insights, coordination, optimizations, backups = await asyncio.gather(
+                self._generate_ai_insights(trip_data, itinerary),
+                self._generate_coordination_recommendations(itinerary, coordination_data),
+                self._generate_optimization_suggestions(itinerary),
+                self._generate_backup_plans(itinerary),
+                return_exceptions=True
+            )
             
             # Add A2A coordination metadata
             result = {
                 "agent_id": self.agent_id,
-                "itinerary": [asdict(day) for day in itinerary],
-                "ai_insights": await self._generate_ai_insights(trip_data, itinerary),
-                "coordination_recommendations": await self._generate_coordination_recommendations(itinerary, coordination_data),
-                "optimization_suggestions": await self._generate_optimization_suggestions(itinerary),
-                "backup_plans": await self._generate_backup_plans(itinerary),
-                "total_estimated_cost": sum(day.daily_budget for day in itinerary),
+                "itinerary": itinerary,
+                "ai_insights": self._section_or_default(insights, {}, "ai_insights"),
+                "coordination_recommendations": self._section_or_default(coordination, {}, "coordination_recommendations"),
+                "optimization_suggestions": self._section_or_default(optimizations, [], "optimization_suggestions"),
+                "backup_plans": self._section_or_default(backups, [], "backup_plans"),
+                "total_estimated_cost": total_budget,
                 "confidence_score": 0.85,
                 "last_updated": datetime.now().isoformat()
             }
             
             logger.info(f"✅ Generated {len(itinerary)}-day AI itinerary with coordination data")
+            # Only real itineraries are cached; the placeholder would otherwise
+            # stand in for this request for the whole TTL
+            if parsed is not None:
+                self._store_itinerary(cache_key, dict(result))
             return result
             
         except Exception as e:
@@ -138,16 +327,18 @@ class GeminiAIAgent:
         logger.info(f"🎯 AI optimizing itinerary with goals: {optimization_goals}")
         
         try:
-            # AI-powered optimization logic
-            optimizations = []
-            
-            for goal in optimization_goals:
-                if goal == 'budget':
-                    optimizations.extend(await self._optimize_for_budget(current_itinerary, agent_constraints))
-                elif goal == 'time':
-                    optimizations.extend(await self._optimize_for_time(current_itinerary, agent_constraints))
-                elif goal == 'experience':
-                    optimizations.extend(await self._optimize_for_experience(current_itinerary, agent_constraints))
+            # AI-powered optimization logic: goals are independent, so they run
+            # concurrently; results keep the order the goals were given in
+            optimizers = {
+                'budget': self._optimize_for_budget,
+                'time': self._optimize_for_time,
+                'experience': self._optimize_for_experience
+            }
+            results = await asyncio.gather(*[
+                optimizers[goal](current_itinerary, agent_constraints)
+                for goal in optimization_goals if goal in optimizers
+            ])
+            optimizations = list(itertools.chain.from_iterable(results))
             
             return {
                 "agent_id": self.agent_id,
@@ -176,16 +367,8 @@ class GeminiAIAgent:
         
         try:
             # AI disruption handling
-            alternatives = []
-            
-            if disruption_type == 'flight_delay':
-                alternatives = await self._handle_flight_delay(request_data, current_itinerary)
-            elif disruption_type == 'weather':
-                alternatives = await self._handle_weather_disruption(request_data, current_itinerary)
-            elif disruption_type == 'venue_closure':
-                alternatives = await self._handle_venue_closure(request_data, current_itinerary)
-            else:
-                alternatives = await self._handle_general_disruption(request_data, current_itinerary)
+            handler = self._disruption_handlers.get(disruption_type, self._handle_general_disruption)
+            alternatives = await handler(request_data, current_itinerary)
             
             return {
                 "agent_id": self.agent_id,
@@ -252,6 +435,45 @@ class GeminiAIAgent:
     
     # Helper methods for AI processing
     
+    @staticmethod
+    def _section_or_default(section: Any, default: Any, name: str) -> Any:
+        """Return a gathered itinerary section, or default if it raised"""
+        if isinstance(section, Exception):
+            logger.warning(f"⚠️ Could not generate {name}: {section}")
+            return default
+        return section
+    
+    @staticmethod
+    def _itinerary_cache_key(trip_data: Dict[str, Any], special_instructions: Optional[str],
+                             coordination_data: Dict[str, Any]) -> str:
+        """Hash of an itinerary request, independent of key order"""
+        canonical = orjson.dumps(
+            {"t": trip_data, "s": special_instructions, "c": coordination_data},
+            option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+    
+    def _cached_itinerary(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached itinerary for a request, if still fresh
+        
+        The entry is shared with later hits and must be copied, not mutated.
+        """
+        cached = self._itinerary_cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic_ns():
+            del self._itinerary_cache[key]
+            return None
+        self._itinerary_cache.move_to_end(key)
+        return cached[1]
+    
+    def _store_itinerary(self, key: str, result: Dict[str, Any]):
+        """Cache an itinerary result, evicting the least recently used"""
+        self._itinerary_cache[key] = (time.monotonic_ns() + ITINERARY_CACHE_TTL * 1_000_000_000, result)
+        self._itinerary_cache.move_to_end(key)
+        while len(self._itinerary_cache) > ITINERARY_CACHE_SIZE:
+            self._itinerary_cache.popitem(last=False)
+    
     async def _create_a2a_itinerary_prompt(self, trip_data: Dict[str, Any], 
                                          special_instructions: Optional[str],
                                          coordination_data: Dict[str, Any]) -> str:
@@ -341,7 +563,7 @@ Generate a detailed day-by-day itinerary that maximizes coordination between age
         
         return {
             "agent_id": self.agent_id,
-            "itinerary": [asdict(day) for day in mock_itinerary],
+            "itinerary": mock_itinerary,
             "ai_insights": {
                 "optimization_opportunities": ["Bundle activities for transport savings", "Coordinate meal times with energy levels"],
                 "personalization_score": 0.87,
@@ -447,40 +669,24 @@ Generate a detailed day-by-day itinerary that maximizes coordination between age
             }
         ]
     
-    def _get_required_agent_coordination(self, disruption_type: str) -> List[str]:
+    def _get_required_agent_coordination(self, disruption_type: str) -> Tuple[str, ...]:
         """Determine which agents need coordination for disruption handling"""
-        coordination_map = {
-            'flight_delay': ['hotel-booking-agent', 'activity-planning-agent'],
-            'weather': ['activity-planning-agent'],
-            'venue_closure': ['activity-planning-agent'],
-            'budget_change': ['flight-booking-agent', 'hotel-booking-agent', 'activity-planning-agent'],
-            'general': ['all-agents']
-        }
-        return coordination_map.get(disruption_type, ['activity-planning-agent'])
+        return _COORDINATION_MAP.get(disruption_type, _DEFAULT_COORDINATION)
     
     def _estimate_disruption_impact(self, severity: str, affected_components: List[str]) -> Dict[str, str]:
         """Estimate the impact of disruption"""
-        impact_levels = {
-            'low': {'cost': '$0-25', 'time': '0-30 min', 'experience': 'Minimal'},
-            'medium': {'cost': '$25-75', 'time': '30-120 min', 'experience': 'Moderate'}, 
-            'high': {'cost': '$75-200+', 'time': '2-6 hours', 'experience': 'Significant'}
-        }
-        return impact_levels.get(severity, impact_levels['medium'])
+        return _IMPACT_LEVELS.get(severity, _IMPACT_LEVELS['medium'])
     
-    def _get_seasonal_recommendations(self, travel_dates: List[str]) -> List[str]:
+    def _get_seasonal_recommendations(self, travel_dates: List[str]) -> Tuple[str, ...]:
         """Get seasonal recommendations based on travel dates"""
-        return [
-            "Fall season: Perfect weather for outdoor activities",
-            "Hurricane season precaution: Monitor weather 48h before outdoor plans",
-            "Festival season: Book popular venues 2 weeks in advance"
-        ]
+        return _SEASONAL_RECOMMENDATIONS
     
     # Gemini API methods (preserved from original)
     
     async def _call_gemini_api(self, prompt: str, task_type: str) -> str:
-        """Make API call to Gemini"""
+        """Stream a Gemini completion, stopping once an itinerary's JSON is complete"""
         
-        url = f"{self.base_url}/models/gemini-1.5-flash-latest:generateContent?key={self.api_key}"
+        url = f"{self.base_url}/models/gemini-1.5-flash-latest:streamGenerateContent?alt=sse&key={self.api_key}"
         
         payload = {
             "contents": [{
@@ -490,35 +696,57 @@ Generate a detailed day-by-day itinerary that maximizes coordination between age
                 "temperature": 0.7,
                 "topK": 40,
                 "topP": 0.95,
-                "maxOutputTokens": 8192,
+                "maxOutputTokens": GEMINI_MAX_OUTPUT_TOKENS.get(task_type, GEMINI_DEFAULT_MAX_OUTPUT_TOKENS),
             }
         }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(url, json=payload)
+        # Itineraries are parsed from the first JSON object carrying days, so
+        # whatever Gemini writes after it needn't be waited for
+        scanner = JSONObjectScanner() if task_type == "generate-itinerary" else None
+        parts = []
+        
+        async with self._http().stream("POST", url, json=payload) as response:
             response.raise_for_status()
             
-            data = response.json()
-            
-            if "candidates" in data and data["candidates"]:
-                content = data["candidates"][0]["content"]["parts"][0]["text"]
-                return content
-            else:
-                raise Exception("No content generated by Gemini")
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                
+                chunk = orjson.loads(line[5:])
+                if not chunk.get("candidates"):
+                    continue
+                for part in chunk["candidates"][0].get("content", {}).get("parts", []):
+                    text = part.get("text")
+                    if not text:
+                        continue
+                    parts.append(text)
+                    if scanner is not None:
+                        data = decode_itinerary_json(scanner.feed(text))
+                        if data is not None:
+                            logger.info("⚡ Itinerary JSON complete - closing Gemini stream early")
+                            return "".join(parts)
+        
+        if not parts:
+            raise Exception("No content generated by Gemini")
+        return "".join(parts)
     
-    async def _parse_itinerary_response(self, response: str, trip_data: Dict[str, Any]) -> List[DailyItinerary]:
-        """Parse Gemini's response into structured itinerary"""
+    async def _parse_itinerary_response(self, response: str,
+                                        trip_data: Dict[str, Any]) -> Optional[Tuple[List[DailyItinerary], float]]:
+        """Parse Gemini's response into structured itinerary and its total budget
+        
+        Returns None when the response holds no usable itinerary, including
+        one with no days.
+        """
         
         try:
-            # Try to extract JSON from the response
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
+            # Extract the itinerary object from the response, skipping any
+            # prose or code fences around it
+            data = decode_itinerary_json(JSONObjectScanner().feed(response))
             
-            if json_start != -1 and json_end != -1:
-                json_str = response[json_start:json_end]
-                data = json.loads(json_str)
+            if data is not None:
                 
                 itineraries = []
+                total_budget = 0.0
                 
                 for day_data in data.get("days", []):
                     events = []
@@ -537,29 +765,36 @@ Generate a detailed day-by-day itinerary that maximizes coordination between age
                         )
                         events.append(event)
                     
+                    daily_budget = float(day_data.get("daily_budget", 0))
                     daily_itinerary = DailyItinerary(
                         date=day_data["date"],
                         day_of_week=day_data.get("day_of_week", ""),
                         location=day_data.get("location", ""),
                         events=events,
-                        daily_budget=float(day_data.get("daily_budget", 0)),
+                        daily_budget=daily_budget,
                         weather_note=day_data.get("weather_note")
                     )
                     itineraries.append(daily_itinerary)
+                    total_budget += daily_budget
                 
-                return itineraries
+                if itineraries:
+                    return itineraries, total_budget
             
         except Exception as e:
             logger.error(f"❌ Failed to parse Gemini response: {e}")
         
-        # Fallback to mock itinerary
+        return None
+    
+    @staticmethod
+    def _placeholder_itinerary() -> Tuple[List[DailyItinerary], float]:
+        """Single placeholder day used when Gemini's response can't be parsed"""
         return [DailyItinerary(
             date="2025-09-28",
             day_of_week="Sunday", 
             location="Destination",
             events=[],
             daily_budget=100.0
-        )]
+        )], 100.0
     
     async def _generate_ai_insights(self, trip_data: Dict, itinerary: List[DailyItinerary]) -> Dict[str, Any]:
         """Generate AI insights about the itinerary"""
@@ -615,10 +850,21 @@ Generate a detailed day-by-day itinerary that maximizes coordination between age
 def create_gemini_ai_agent_app() -> FastAPI:
     """Create standalone FastAPI app for GeminiAIAgent"""
     
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # One client for the process, shared by the agent instances it serves
+        app.state.http = create_gemini_http_client()
+        agent.set_http_client(app.state.http)
+        yield
+        await agent.aclose()
+        await app.state.http.aclose()
+    
     app = FastAPI(
         title="GeminiAIAgent",
         description="AI-powered agent for comprehensive trip planning and optimization",
-        version="2.0.0"
+        version="2.0.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
     )
     
     # Add CORS for cross-agent communication
@@ -633,55 +879,62 @@ def create_gemini_ai_agent_app() -> FastAPI:
     # Initialize agent
     agent = GeminiAIAgent()
     
+    # Discovery payloads never change for a running agent, so they are
+    # encoded once and served as bytes
+    root_bytes = orjson.dumps({
+        "agent": agent.name,
+        "agent_id": agent.agent_id,
+        "version": agent.version,
+        "capabilities": agent.capabilities,
+        "status": "active",
+        "ai_powered": True,
+        "endpoints": {
+            "generate_itinerary": "/api/generate-itinerary",
+            "optimize_itinerary": "/api/optimize-itinerary",
+            "handle_disruption": "/api/handle-disruption",
+            "local_insights": "/api/local-insights",
+            "agent_info": "/.well-known/agent"
+        }
+    })
+    agent_card_bytes = orjson.dumps({
+        "name": agent.name,
+        "agent_id": agent.agent_id,
+        "version": agent.version,
+        "description": "AI-powered agent for comprehensive trip planning, optimization, and disruption handling",
+        "capabilities": agent.capabilities,
+        "endpoints": {
+            "generate_comprehensive_itinerary": "/api/generate-itinerary",
+            "optimize_existing_itinerary": "/api/optimize-itinerary", 
+            "handle_trip_disruption": "/api/handle-disruption",
+            "provide_local_insights": "/api/local-insights"
+        },
+        "communication_protocols": ["HTTP", "JSON"],
+        "ai_powered": True,
+        "gemini_integration": bool(agent.api_key),
+        "specializes_in": ["itinerary_generation", "trip_optimization", "disruption_handling"],
+        "collaboration_with": ["flight-booking-agent", "hotel-booking-agent", "activity-planning-agent"],
+        "coordination_capabilities": ["budget_optimization", "schedule_coordination", "alternative_planning"]
+    })
+    
     @app.get("/")
     async def root():
-        return {
-            "agent": agent.name,
-            "agent_id": agent.agent_id,
-            "version": agent.version,
-            "capabilities": agent.capabilities,
-            "status": "active",
-            "ai_powered": True,
-            "endpoints": {
-                "generate_itinerary": "/api/generate-itinerary",
-                "optimize_itinerary": "/api/optimize-itinerary",
-                "handle_disruption": "/api/handle-disruption",
-                "local_insights": "/api/local-insights",
-                "agent_info": "/.well-known/agent"
-            }
-        }
+        return Response(content=root_bytes, media_type="application/json")
     
     @app.get("/.well-known/agent")
     async def get_agent_card():
         """A2A Agent Card for discovery"""
-        return {
-            "name": agent.name,
-            "agent_id": agent.agent_id,
-            "version": agent.version,
-            "description": "AI-powered agent for comprehensive trip planning, optimization, and disruption handling",
-            "capabilities": agent.capabilities,
-            "endpoints": {
-                "generate_comprehensive_itinerary": "/api/generate-itinerary",
-                "optimize_existing_itinerary": "/api/optimize-itinerary", 
-                "handle_trip_disruption": "/api/handle-disruption",
-                "provide_local_insights": "/api/local-insights"
-            },
-            "communication_protocols": ["HTTP", "JSON"],
-            "ai_powered": True,
-            "gemini_integration": bool(agent.api_key),
-            "specializes_in": ["itinerary_generation", "trip_optimization", "disruption_handling"],
-            "collaboration_with": ["flight-booking-agent", "hotel-booking-agent", "activity-planning-agent"],
-            "coordination_capabilities": ["budget_optimization", "schedule_coordination", "alternative_planning"]
-        }
+        return Response(content=agent_card_bytes, media_type="application/json")
     
     @app.post("/api/generate-itinerary")
     async def generate_itinerary(request_data: Dict[str, Any]):
         """Generate comprehensive AI-powered itinerary"""
         result = await agent.generate_comprehensive_itinerary(request_data)
-        return {
+        # Returned as a response so orjson encodes the itinerary dataclasses
+        # directly; jsonable_encoder would asdict() every day and event first
+        return ORJSONResponse({
             "success": True,
             "itinerary_result": result
-        }
+        })
     
     @app.post("/api/optimize-itinerary")
     async def optimize_itinerary(request_data: Dict[str, Any]):
@@ -7,13 +7,36 @@ including flights, hotels, and activities.
 
 import asyncio
 import httpx
-from typing import List, Dict, Any, Optional, cast
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Any, Optional, cast
 from datetime import datetime, date
 from decimal import Decimal
 import os
 from dataclasses import dataclass
 
 
+@asynccontextmanager
+async def _http_client(shared: Optional[httpx.AsyncClient], timeout: float) -> AsyncIterator[httpx.AsyncClient]:
+    """Use the injected shared client if there is one, else a short-lived client
+    
+    A shared client keeps its own default timeout, so calls made through this
+    helper pass timeout= explicitly as well.
+    """
+    if shared is not None:
+        yield shared
+    else:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            yield client
+
+
+class TravelAPIConfigurationError(Exception):
+    """An API can't be used as configured: credentials are missing or rejected
+    
+    Calling again won't change the outcome, so the error is marked non-retryable.
+    """
+    retryable = False
+
+
 @dataclass
 class FlightSearchParams:
     origin: str
@@ -36,7 +59,9 @@ class HotelSearchParams:
 class FlightBookingAPI:
     """Integration with flight booking APIs (Amadeus, Skyscanner, etc.)"""
     
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client
+        
         # Load environment variables
         from dotenv import load_dotenv
         load_dotenv()
@@ -123,23 +148,25 @@ class FlightBookingAPI:
         if self.access_token:
             return self.access_token
 
+        # Try sandbox first (common for developer keys), then production
+        token_endpoints = [
+            "https://test.api.amadeus.com/v1/security/oauth2/token",
+            "https://api.amadeus.com/v1/security/oauth2/token",
+        ]
+        # Token endpoints that refused the credentials themselves, as opposed
+        # to being unreachable
+        rejected = 0
         try:
-            # Try sandbox first (common for developer keys), then production
-            token_endpoints = [
-                "https://test.api.amadeus.com/v1/security/oauth2/token",
-                "https://api.amadeus.com/v1/security/oauth2/token",
-            ]
-
             data = {
                 "grant_type": "client_credentials",
                 "client_id": self.amadeus_key,
                 "client_secret": self.amadeus_secret
             }
 
-            async with httpx.AsyncClient(timeout=15.0) as client:
+            async with _http_client(self.client, 15.0) as client:
                 for token_url in token_endpoints:
                     try:
-                        resp = await client.post(token_url, data=data)
+                        resp = await client.post(token_url, data=data, timeout=15.0)
                     except Exception as e:
                         print(f"❌ Error requesting token from {token_url}: {e}")
                         continue
@@ -151,12 +178,17 @@ class FlightBookingAPI:
                         print(f"✅ Amadeus access token obtained from {token_url}")
                         return self.access_token
                     else:
+                        if resp.status_code in (400, 401):
+                            rejected += 1
                         # Print the first chunk of response to aid debugging
                         snippet = resp.text[:400].replace('\n', ' ')
                         print(f"❌ Amadeus token request to {token_url} failed: {resp.status_code} {snippet}")
         except Exception as e:
             print(f"❌ Error obtaining Amadeus token: {e}")
 
+        if rejected == len(token_endpoints):
+            raise TravelAPIConfigurationError("Amadeus rejected the configured API credentials")
+
         # fallback
         self.access_token = "mock_access_token"
         return self.access_token
@@ -172,7 +204,7 @@ class FlightBookingAPI:
                 print(f"✈️  Searching flights via configured Flight API provider from {params.origin} to {params.destination}")
                 return await self._real_flight_search(params)
             else:
-                raise Exception("No flight API credentials configured")
+                raise TravelAPIConfigurationError("No flight API credentials configured")
                 
         except Exception as e:
             print(f"❌ Flight search error: {e}")
@@ -212,8 +244,8 @@ class FlightBookingAPI:
                 print(f"🔄 Round-trip search: Return on {query['returnDate']}")
 
             print(f"🌐 Amadeus flight search: {origin_code} -> {dest_code} on {departure_date}")
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.get(search_url, headers=headers, params=query)
+            async with _http_client(self.client, 30.0) as client:
+                resp = await client.get(search_url, headers=headers, params=query, timeout=30.0)
                 print(f"✈️ Amadeus API status: {resp.status_code}")
                 if resp.status_code != 200:
                     print(f"❌ Amadeus flight search failed: {resp.status_code} {resp.text[:300]}")
@@ -356,6 +388,8 @@ class FlightBookingAPI:
                     print("⚠️  No offers from Amadeus, falling back to mock flights")
                     return await self._mock_flight_search(params)
 
+        except TravelAPIConfigurationError:
+            raise
         except Exception as e:
             print(f"❌ Error during Amadeus flight search: {e}")
             return await self._mock_flight_search(params)
@@ -475,7 +509,9 @@ class FlightBookingAPI:
 class HotelBookingAPI:
     """Integration with hotel booking APIs (Amadeus, Booking.com, etc.)"""
     
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client
+        
         # Load environment variables
         from dotenv import load_dotenv
         load_dotenv()
@@ -839,7 +875,9 @@ class HotelBookingAPI:
 class ActivityBookingAPI:
     """Integration with TripAdvisor and other activity booking APIs"""
     
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client
+        
         # Load environment variables
         from dotenv import load_dotenv
         load_dotenv()
@@ -902,14 +940,14 @@ class ActivityBookingAPI:
             all_activities = []
             
             print(f"🔍 Searching TripAdvisor for diverse activities in: {destination}")
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with _http_client(self.client, 30.0) as client:
                 for search_query in search_queries[:3]:  # Try first 3 queries to avoid timeout
                     try:
                         # Step 1: Search for location ID 
                         location_url = "https://tripadvisor16.p.rapidapi.com/api/v1/attraction/searchLocation"
                         location_params = {"query": search_query}
                         
-                        location_response = await client.get(location_url, headers=headers, params=location_params)
+                        location_response = await client.get(location_url, headers=headers, params=location_params, timeout=30.0)
                         location_data = location_response.json()
                         
                         if not location_data.get("data"):
@@ -921,7 +959,7 @@ class ActivityBookingAPI:
                         attractions_url = "https://tripadvisor16.p.rapidapi.com/api/v1/attraction/searchAttractions" 
                         attractions_params = {"locationId": location_id}
                         
-                        attractions_response = await client.get(attractions_url, headers=headers, params=attractions_params)
+                        attractions_response = await client.get(attractions_url, headers=headers, params=attractions_params, timeout=30.0)
                         attractions_data = attractions_response.json()
                         
                         if attractions_data.get("data", {}).get("data"):
@@ -946,7 +984,7 @@ class ActivityBookingAPI:
                     print(f"⚠️ TripAdvisor unavailable (rate limited) - using working activity data")
                     return await self._mock_activity_search(destination, max_budget, preferences)
                 
-                attractions_response = await client.get(attractions_url, headers=headers, params=attractions_params)
+                attractions_response = await client.get(attractions_url, headers=headers, params=attractions_params, timeout=30.0)
                 attractions_data = attractions_response.json()
                 
                 activities = []
@@ -1100,7 +1138,7 @@ class ActivityBookingAPI:
             if not google_places_key:
                 return ""
             
-            async with httpx.AsyncClient(timeout=15.0) as client:
+            async with _http_client(self.client, 15.0) as client:
                 # Search for the specific place
                 search_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
                 search_params = {
@@ -1108,7 +1146,7 @@ class ActivityBookingAPI:
                     "key": google_places_key
                 }
                 
-                response = await client.get(search_url, params=search_params)
+                response = await client.get(search_url, params=search_params, timeout=15.0)
                 response.raise_for_status()
                 search_data = response.json()
                 
@@ -1460,7 +1498,9 @@ class ActivityBookingAPI:
 class RestaurantBookingAPI:
     """Integration with Google Places API for restaurant searches"""
     
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client
+        
         from dotenv import load_dotenv
         load_dotenv()
         
@@ -1502,7 +1542,7 @@ class RestaurantBookingAPI:
             search_query = " ".join(query_parts)
             
             # Use Google Places Text Search API
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with _http_client(self.client, 30.0) as client:
                 # Text search for restaurants
                 text_search_url = f"{self.google_places_base_url}/textsearch/json"
                 text_params = {
@@ -1511,20 +1551,22 @@ class RestaurantBookingAPI:
                     "key": self.google_places_key
                 }
                 
-                response = await client.get(text_search_url, params=text_params)
+                response = await client.get(text_search_url, params=text_params, timeout=30.0)
                 response.raise_for_status()
                 search_data = response.json()
                 
                 restaurants = []
                 if search_data.get("status") == "OK" and search_data.get("results"):
-                    for place in search_data["results"][:6]:  # Get top 6 restaurants
-                        # Get detailed information for each restaurant
-                        place_id = place.get("place_id")
-                        if place_id:
-                            details = await self._get_place_details(client, place_id)
-                            restaurant_info = self._parse_restaurant_data(place, details, max_budget_per_meal)
-                            if restaurant_info:
-                                restaurants.append(restaurant_info)
+                    # Top 6 restaurants; Place Details takes one place_id per call,
+                    # so fetch them concurrently over the same client
+                    places = [place for place in search_data["results"][:6] if place.get("place_id")]
+                    all_details = await asyncio.gather(
+                        *(self._get_place_details(client, place["place_id"], 30.0) for place in places)
+                    )
+                    for place, details in zip(places, all_details):
+                        restaurant_info = self._parse_restaurant_data(place, details, max_budget_per_meal)
+                        if restaurant_info:
+                            restaurants.append(restaurant_info)
                 
                 if restaurants:
                     print(f"🍽️ Found {len(restaurants)} restaurants via Google Places API")
@@ -1537,7 +1579,8 @@ class RestaurantBookingAPI:
             print(f"❌ Google Places API error: {e}")
             raise e
     
-    async def _get_place_details(self, client: httpx.AsyncClient, place_id: str) -> Dict[str, Any]:
+    async def _get_place_details(self, client: httpx.AsyncClient, place_id: str,
+                                 timeout: float) -> Dict[str, Any]:
         """Get detailed information about a restaurant"""
         try:
             details_url = f"{self.google_places_base_url}/details/json"
@@ -1547,7 +1590,7 @@ class RestaurantBookingAPI:
                 "key": self.google_places_key
             }
             
-            response = await client.get(details_url, params=details_params)
+            response = await client.get(details_url, params=details_params, timeout=timeout)
             response.raise_for_status()
             details_data = response.json()
             
@@ -1677,11 +1720,13 @@ class RestaurantBookingAPI:
 class TravelAPIManager:
     """Main manager for all travel API integrations"""
     
-    def __init__(self):
-        self.flight_api = FlightBookingAPI()
-        self.hotel_api = HotelBookingAPI()
-        self.activity_api = ActivityBookingAPI()
-        self.restaurant_api = RestaurantBookingAPI()  # ← NEW
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        # An optional shared client keeps upstream connections alive across
+        # searches; the owner of the client is responsible for closing it.
+        self.flight_api = FlightBookingAPI(client)
+        self.hotel_api = HotelBookingAPI(client)
+        self.activity_api = ActivityBookingAPI(client)
+        self.restaurant_api = RestaurantBookingAPI(client)  # ← NEW
     
     async def search_restaurants(self, destination: str, max_budget_per_meal: float = 50.0,
                                cuisine_preferences: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
@@ -0,0 +1,14 @@
+import os
+import sys
+
+
+# The travel agents are standalone scripts in src/agents rather than a
+# package, and they import travel_apis from src; make both importable by
+# module name.
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'src',
+)
+for path in (SRC_DIR, os.path.join(SRC_DIR, 'agents')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,71 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+import pytest_asyncio
+
+
+pytest.importorskip('fastapi', reason='Agent tests require FastAPI')
+pytest.importorskip('httpx', reason='Agent tests require httpx')
+pytest.importorskip('orjson', reason='Agent tests require orjson')
+pytest.importorskip('uvicorn', reason='Agent tests require uvicorn')
+
+from activity_planning_agent import ActivityPlanningAgent  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def agent():
+    travel_apis = Mock()
+    travel_apis.search_restaurants = AsyncMock()
+    with patch(
+        'activity_planning_agent.acquire_api_mgr', return_value=travel_apis
+    ):
+        agent = ActivityPlanningAgent()
+    yield agent
+    await agent.aclose()
+
+
+def restaurant(name, price):
+    return {'name': name, 'avg_price_per_person': price, 'types': []}
+
+
+@pytest.mark.asyncio
+async def test_search_restaurants_all_over_budget_is_not_retried(agent):
+    agent.travel_apis.search_restaurants.return_value = {
+        'restaurants': [restaurant('Steakhouse', 200)]
+    }
+    with patch.object(agent, '_backoff', AsyncMock()) as backoff:
+        result = await agent.search_restaurants(
+            {'destination': 'Paris', 'budget_per_person': 50}
+        )
+
+    assert result == []
+    agent.travel_apis.search_restaurants.assert_awaited_once()
+    backoff.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_search_restaurants_filters_by_budget(agent):
+    agent.travel_apis.search_restaurants.return_value = {
+        'restaurants': [restaurant('Bistro', 40), restaurant('Steakhouse', 200)]
+    }
+    result = await agent.search_restaurants(
+        {'destination': 'Paris', 'budget_per_person': 50}
+    )
+
+    assert [r['name'] for r in result] == ['Bistro']
+
+
+@pytest.mark.asyncio
+async def test_search_restaurants_retries_empty_upstream_result(agent):
+    agent.travel_apis.search_restaurants.side_effect = [
+        {'restaurants': []},
+        {'restaurants': [restaurant('Bistro', 40)]},
+    ]
+    with patch.object(agent, '_backoff', AsyncMock(return_value=0.5)) as backoff:
+        result = await agent.search_restaurants(
+            {'destination': 'Paris', 'budget_per_person': 50}
+        )
+
+    assert [r['name'] for r in result] == ['Bistro']
+    assert agent.travel_apis.search_restaurants.await_count == 2
+    backoff.assert_awaited_once()
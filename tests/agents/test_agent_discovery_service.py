@@ -0,0 +1,82 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+
+pytest.importorskip('fastapi', reason='Agent tests require FastAPI')
+httpx = pytest.importorskip('httpx', reason='Agent tests require httpx')
+pytest.importorskip('uvicorn', reason='Agent tests require uvicorn')
+
+from agent_discovery_service import (  # noqa: E402
+    AgentDiscoveryService,
+    AgentInfo,
+)
+
+
+FLIGHT_AGENT_URL = 'http://localhost:8001'
+
+
+@pytest_asyncio.fixture
+async def service():
+    service = AgentDiscoveryService()
+    service.agent_registry['flight-booking-agent'] = AgentInfo(
+        agent_id='flight-booking-agent',
+        name='FlightBookingAgent',
+        version='1.0.0',
+        base_url=FLIGHT_AGENT_URL,
+        capabilities=['flight_search'],
+        endpoints={},
+        last_seen=datetime.now(),
+    )
+    yield service
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_isolates_malformed_calls(service):
+    url = f'{FLIGHT_AGENT_URL}/api/search-flights'
+    response = httpx.Response(
+        200, json={'success': True}, request=httpx.Request('POST', url)
+    )
+    with patch.object(
+        service._client, 'post', AsyncMock(return_value=response)
+    ) as post:
+        results = await service.execute_batch(
+            [
+                'not-a-call',
+                {'agent': 42, 'path': '/api/search-flights'},
+                {'agent': 'flight-booking-agent', 'path': ['/api/']},
+                {
+                    'agent': 'flight-booking-agent',
+                    'path': '/api/search-flights',
+                    'body': {'destination': 'LAX'},
+                },
+            ]
+        )
+
+    assert [r['success'] for r in results] == [False, False, False, True]
+    assert results[0]['error'] == 'Each batch call must be an object'
+    assert results[1]['error'] == 'Batch call agent and path must be strings'
+    assert results[2]['error'] == 'Batch call agent and path must be strings'
+    assert results[3]['result'] == {'success': True}
+    post.assert_awaited_once()
+    assert post.await_args.args[0] == url
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_unknown_agent_and_path(service):
+    with patch.object(service._client, 'post', AsyncMock()) as post:
+        results = await service.execute_batch(
+            [
+                {'agent': 'missing-agent', 'path': '/api/search'},
+                {'agent': 'flight-booking-agent', 'path': '/admin'},
+                {'agent': 'flight-booking-agent', 'path': '/api/negotiate-price'},
+            ]
+        )
+
+    assert results[0]['error'] == 'Agent missing-agent not found in registry'
+    assert results[1]['error'] == "/admin can't be batched"
+    assert results[2]['error'] == "/api/negotiate-price can't be batched"
+    post.assert_not_awaited()
@@ -0,0 +1,229 @@
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+
+pytest.importorskip('fastapi', reason='Agent tests require FastAPI')
+pytest.importorskip('httpx', reason='Agent tests require httpx')
+pytest.importorskip('orjson', reason='Agent tests require orjson')
+pytest.importorskip('uvicorn', reason='Agent tests require uvicorn')
+pytest.importorskip('dotenv', reason='Agent tests require python-dotenv')
+
+import flight_booking_agent  # noqa: E402
+
+from flight_booking_agent import FlightBookingAgent  # noqa: E402
+from travel_apis import TravelAPIConfigurationError  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def agent():
+    agent = FlightBookingAgent()
+    assert agent.travel_apis is not None
+    yield agent
+    await agent.aclose()
+
+
+@pytest.fixture
+def no_backoff():
+    with patch.object(flight_booking_agent, 'RETRY_BASE_DELAY', 0.0):
+        yield
+
+
+@pytest.fixture
+def no_hedge_wait():
+    """Launch hedged attempts back to back instead of seconds apart."""
+    with (
+        patch.object(flight_booking_agent, 'HEDGE_DELAYS', (0.0, 0.01, 0.02)),
+        patch.object(flight_booking_agent, 'RETRY_BASE_DELAY', 0.0),
+    ):
+        yield
+
+
+def search_request(budget):
+    return {
+        'departure_location': 'NYC',
+        'destination': 'LAX',
+        'start_date': '2025-11-15',
+        'travelers': 2,
+        'budget': budget,
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_flights_missing_credentials_not_retried(
+    agent, no_backoff
+):
+    with (
+        patch.object(
+            agent.travel_apis.flight_api,
+            'search_flights',
+            AsyncMock(
+                side_effect=TravelAPIConfigurationError(
+                    'No flight API credentials configured'
+                )
+            ),
+        ) as search,
+        pytest.raises(TravelAPIConfigurationError),
+    ):
+        await agent.search_flights(search_request(1000))
+
+    search.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_search_flights_retries_other_errors(agent, no_backoff):
+    with (
+        patch.object(
+            agent.travel_apis.flight_api,
+            'search_flights',
+            AsyncMock(side_effect=Exception('upstream hiccup')),
+        ) as search,
+        pytest.raises(Exception, match='after 3 attempts: upstream hiccup'),
+    ):
+        await agent.search_flights(search_request(1000))
+
+    assert search.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_search_flights_rejects_malformed_dates(agent):
+    with patch.object(
+        agent.travel_apis.flight_api, 'search_flights', AsyncMock()
+    ) as search:
+        for start_date in ('20251115', '2025-11-15T08:00', '2025-02-30', 20251115):
+            with pytest.raises(ValueError):
+                await agent.search_flights(
+                    {**search_request(1000), 'start_date': start_date}
+                )
+
+    search.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_search_flights_passes_budget_as_max_price(agent):
+    flight_api = agent.travel_apis.flight_api
+    with patch.object(
+        flight_api,
+        'search_flights',
+        AsyncMock(side_effect=flight_api._mock_flight_search),
+    ) as search:
+        flights = await agent.search_flights(search_request(2000))
+
+    params = search.await_args.args[0]
+    # 40% of the trip budget for flights, per traveler
+    assert params.max_price == Decimal('400')
+    assert flights
+    assert all(flight.price <= 400 for flight in flights)
+
+
+@pytest.mark.asyncio
+async def test_search_flights_mock_pricing_follows_budget(agent):
+    flight_api = agent.travel_apis.flight_api
+    with patch.object(
+        flight_api,
+        'search_flights',
+        AsyncMock(side_effect=flight_api._mock_flight_search),
+    ):
+        cheap = await agent.search_flights(search_request(1000))
+        dear = await agent.search_flights(search_request(2000))
+
+    assert max(f.price for f in cheap) < max(f.price for f in dear)
+
+
+@pytest.mark.asyncio
+async def test_search_flights_caches_per_budget(agent):
+    flight_api = agent.travel_apis.flight_api
+    with patch.object(
+        flight_api,
+        'search_flights',
+        AsyncMock(side_effect=flight_api._mock_flight_search),
+    ) as search:
+        await agent.search_flights(search_request(1000))
+        await agent.search_flights(search_request(1000))
+        await agent.search_flights(search_request(2000))
+
+    assert search.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_failure_then_empty_returns_empty(
+    agent, no_hedge_wait
+):
+    with patch.object(
+        agent.travel_apis.flight_api,
+        'search_flights',
+        AsyncMock(side_effect=[Exception('upstream timeout'), [], []]),
+    ) as search:
+        result = await agent._hedged_search(object())
+
+    assert result == []
+    assert search.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_all_failures_raise(agent, no_hedge_wait):
+    with (
+        patch.object(
+            agent.travel_apis.flight_api,
+            'search_flights',
+            AsyncMock(side_effect=Exception('upstream timeout')),
+        ) as search,
+        pytest.raises(Exception, match='after 3 attempts: upstream timeout'),
+    ):
+        await agent._hedged_search(object())
+
+    assert search.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_returns_first_non_empty_result(
+    agent, no_hedge_wait
+):
+    offer = {'id': 'offer1', 'price': 250.0}
+    with patch.object(
+        agent.travel_apis.flight_api,
+        'search_flights',
+        AsyncMock(side_effect=[Exception('upstream timeout'), [offer], []]),
+    ):
+        result = await agent._hedged_search(object())
+
+    assert result == [offer]
+
+
+async def slow_offer(params):
+    await asyncio.sleep(0.05)
+    return [{'id': 'offer1', 'price': 250.0}]
+
+
+@pytest.mark.asyncio
+async def test_search_not_hedged_by_default(agent, no_hedge_wait):
+    with patch.object(
+        agent.travel_apis.flight_api,
+        'search_flights',
+        AsyncMock(side_effect=slow_offer),
+    ) as search:
+        result = await agent._hedged_search(object())
+
+    assert result == [{'id': 'offer1', 'price': 250.0}]
+    search.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_hedging_launches_attempts_before_the_first_answers(
+    agent, no_hedge_wait
+):
+    with (
+        patch.object(flight_booking_agent, 'HEDGE_SEARCHES', True),
+        patch.object(
+            agent.travel_apis.flight_api,
+            'search_flights',
+            AsyncMock(side_effect=slow_offer),
+        ) as search,
+    ):
+        result = await agent._hedged_search(object())
+
+    assert result == [{'id': 'offer1', 'price': 250.0}]
+    assert search.await_count == 3
@@ -0,0 +1,100 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+
+pytest.importorskip('fastapi', reason='Agent tests require FastAPI')
+pytest.importorskip('httpx', reason='Agent tests require httpx')
+pytest.importorskip('orjson', reason='Agent tests require orjson')
+pytest.importorskip('uvicorn', reason='Agent tests require uvicorn')
+pytest.importorskip('dotenv', reason='Agent tests require python-dotenv')
+
+from gemini_ai_agent import GeminiAIAgent  # noqa: E402
+
+
+ITINERARY_JSON = (
+    '```json\n'
+    '{"days": [{"date": "2025-11-15", "location": "Paris",'
+    ' "daily_budget": 250, "events": [{"title": "Louvre", "cost": 20}]}]}\n'
+    '```'
+)
+
+REQUEST = {'trip_data': {'destination': 'Paris'}}
+
+
+@pytest_asyncio.fixture
+async def agent():
+    agent = GeminiAIAgent()
+    agent.api_key = 'test-key'
+    yield agent
+    await agent.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unparsable_response_is_not_cached(agent):
+    with patch.object(
+        agent,
+        '_call_gemini_api',
+        AsyncMock(return_value='Sorry, I cannot help with that.'),
+    ) as call:
+        first = await agent.generate_comprehensive_itinerary(REQUEST)
+        await agent.generate_comprehensive_itinerary(REQUEST)
+
+    assert first['itinerary'][0].location == 'Destination'
+    assert call.await_count == 2
+    assert not agent._itinerary_cache
+
+
+@pytest.mark.asyncio
+async def test_zero_day_itinerary_is_not_cached(agent):
+    with patch.object(
+        agent,
+        '_call_gemini_api',
+        AsyncMock(return_value='{"summary": "Paris"} {"days": []}'),
+    ) as call:
+        first = await agent.generate_comprehensive_itinerary(REQUEST)
+        await agent.generate_comprehensive_itinerary(REQUEST)
+
+    assert first['itinerary'][0].location == 'Destination'
+    assert call.await_count == 2
+    assert not agent._itinerary_cache
+
+
+@pytest.mark.asyncio
+async def test_cached_itinerary_is_a_fresh_copy(agent):
+    with patch.object(
+        agent, '_call_gemini_api', AsyncMock(return_value=ITINERARY_JSON)
+    ) as call:
+        first = await agent.generate_comprehensive_itinerary(REQUEST)
+        (_, cached), = agent._itinerary_cache.values()
+        cached['last_updated'] = 'stale'
+
+        second = await agent.generate_comprehensive_itinerary(REQUEST)
+        second['confidence_score'] = 0.0
+        third = await agent.generate_comprehensive_itinerary(REQUEST)
+
+    assert call.await_count == 1
+    assert first['itinerary'][0].location == 'Paris'
+    assert first['total_estimated_cost'] == 250.0
+    assert second is not cached
+    assert second['last_updated'] != 'stale'
+    assert third['confidence_score'] == 0.85
+
+
+@pytest.mark.asyncio
+async def test_unencodable_request_falls_back_to_mock(agent):
+    request = {'trip_data': {'travelers': 2**70}}
+    with (
+        patch.object(agent, '_call_gemini_api', AsyncMock()) as call,
+        patch.object(
+            agent,
+            '_generate_enhanced_mock_itinerary',
+            AsyncMock(return_value={'mock': True}),
+        ) as mock_itinerary,
+    ):
+        result = await agent.generate_comprehensive_itinerary(request)
+
+    assert result == {'mock': True}
+    call.assert_not_awaited()
+    mock_itinerary.assert_awaited_once()